@@ -1,20 +1,25 @@
 import os
 import sys
 import inspect
+import copy
+import pickle
+import weakref
 import dataclasses
 from types import MappingProxyType
 from dataclasses import dataclass, field, MISSING, make_dataclass
-from .parseCoordinates import parseCoordinates
 from typing import Iterable, Callable
-from .dictFuncs import dictFuncs
+from .dictFuncs import dictFuncs, writeFile, fieldPlan
+from . import snapshot
+from .datetimeParser import coerceDatetime, coerceDatetimes, dateparserSettings
 from datetime import datetime, date, timezone
-import dateparser
 from inspect import currentframe
-from .log import log
+from .log import log, isEnabledFor
+from .instrument import timed
 from .cmdParse import cmdParse
 
-from ruamel.yaml.comments import CommentedMap
-from zoneinfo import ZoneInfo
+
+# Heavy dependencies (geopandas/pyproj via parseCoordinates, dateparser, ruamel.yaml)
+# are imported on first use so that importing baseClass stays fast
 
 class spatialObject:
 
@@ -36,21 +41,66 @@ class spatialObject:
     
 
     def parse(self,lat,lon):
+        from .parseCoordinates import parseCoordinates
         pC = parseCoordinates(latitude=lat,longitude=lon)
         self.lat_lon = [pC.latitude, pC.longitude]
 
+# Class level reflection (signature, required args, defaults, options) resolved once per class
+@dataclass(frozen=True)
+class classMetadata:
+    parameters: frozenset # accepted init parameters
+    requiredArgs: tuple
+    defaults: MappingProxyType # static default values of init fields
+    factories: MappingProxyType # default_factory references of init fields
+    missing: tuple # init fields without a default or default_factory
+    options: MappingProxyType # option sets from field metadata
+
+classMetadataCache = weakref.WeakKeyDictionary()
+
 # baseClass is a parent dataclass which gives enhanced functionality to dataclasses
 # * Supports type checking
 # * Reading and writing from yaml files (with type checking)
 class baseClassMethods(dictFuncs):
+    __slots__ = ()
+
+    @classmethod
+    def classMetadata(cls):
+        metadata = classMetadataCache.get(cls)
+        if metadata is None:
+            metadata = cls.registerClass()
+        return(metadata)
+
+    @classmethod
+    def registerClass(cls):
+        parameters = inspect.signature(cls.__init__).parameters
+        requiredArgs = tuple(k for k,v in parameters.items() if v.default is v.empty and k != 'self')
+        if dataclasses.is_dataclass(cls):
+            fields = {key:value for key,value in cls.__dataclass_fields__.items() if value.init}
+        else:
+            fields = {}
+        classMetadataCache[cls] = classMetadata(
+            parameters=frozenset(k for k in parameters if k != 'self'),
+            requiredArgs=requiredArgs,
+            defaults=MappingProxyType({key:value.default for key,value in fields.items() if value.default is not MISSING}),
+            factories=MappingProxyType({key:value.default_factory for key,value in fields.items() if value.default_factory is not MISSING}),
+            missing=tuple(key for key,value in fields.items() if value.default is MISSING and value.default_factory is MISSING),
+            options=MappingProxyType({key:value.metadata['options'] for key,value in fields.items() if 'options' in value.metadata}),
+        )
+        return(classMetadataCache[cls])
+
+    # Must be called if a class is modified after its first use
+    @classmethod
+    def invalidateClassMetadata(cls):
+        classMetadataCache.pop(cls,None)
 
     @classmethod
     def defaults(cls):
         if dataclasses.is_dataclass(cls):
-            defaults = {key:value.default for key,value in cls.__dataclass_fields__.items() if value.default is not MISSING and value.init} 
-            factories = {key:value.default_factory() for key,value in cls.__dataclass_fields__.items() if value.default_factory is not MISSING and value.init} 
-            missing = {key:'MISSINGREQUIREDKWARG' for key,value in cls.__dataclass_fields__.items() if value.default is MISSING and value.default_factory is MISSING and value.init} 
-            return defaults | factories | missing
+            metadata = cls.classMetadata()
+            # Factories are still called each time so mutable defaults are never shared
+            factories = {key:factory() for key,factory in metadata.factories.items()}
+            missing = {key:'MISSINGREQUIREDKWARG' for key in metadata.missing}
+            return dict(metadata.defaults) | factories | missing
         else:
             return None
         
@@ -67,17 +117,17 @@ class baseClassMethods(dictFuncs):
                 log(f"Missing required arguments: {'; '.join([k for k,v in kwargs.items() if v == 'MISSINGREQUIREDKWARG'])}")
                 exit()
             out = cls.from_dict(kwargs)
-            out.auxargs = auxargs
+            out.transientState()['auxargs'] = auxargs
             return(out)
         else:
             # config = kwargs.pop('configFile')
             out = cls.from_yaml(fpath=kwargs['configFile'],kwargs=kwargs)
-            out.auxargs = auxargs
+            out.transientState()['auxargs'] = auxargs
             return(out)    
 
     @classmethod
     def requiredArgs(cls):
-        return([k for k,v in inspect.signature(cls.__init__).parameters.items() if v.default is v.empty and k != 'self'])
+        return(list(cls.classMetadata().requiredArgs))
 
     @classmethod
     def from_class(cls,env,kwargs):
@@ -88,20 +138,85 @@ class baseClassMethods(dictFuncs):
         # Source - https://stackoverflow.com/a/55096964
         # Posted by Arne, modified by community. See post 'Timeline' for change history
         # Retrieved 2025-11-21, License - CC BY-SA 4.0    
+        parameters = cls.classMetadata().parameters
         return(cls(**{
             k: v for k, v in env.items() 
-            if k in inspect.signature(cls).parameters
+            if k in parameters
         }))
+
+    # Bulk construction from an iterable of dicts, the signature is only resolved once
+    # Returns a list, or a generator if generator=True
+    @classmethod
+    def from_records(cls,records,generator=False):
+        parameters = cls.classMetadata().parameters
+        instances = (cls(**{k:v for k,v in env.items() if k in parameters}) for env in records)
+        if generator:
+            return(instances)
+        return(list(instances))
+
+    # Bulk construction from a pandas DataFrame (one instance per row)
+    # Simple types are coerced column-wise before construction, so per-instance coercion is skipped where possible
+    @classmethod
+    def from_dataframe(cls,df,generator=False):
+        import pandas as pd
+        parameters = cls.classMetadata().parameters
+        fields = cls.__dataclass_fields__
+        columns = {}
+        for name in df.columns:
+            if name not in parameters:
+                continue
+            column = df[name]
+            dtype = fields[name].type if name in fields else None
+            try:
+                if dtype is float:
+                    column = pd.to_numeric(column,errors='raise').astype(float)
+                elif dtype is int and column.notna().all():
+                    column = pd.to_numeric(column,errors='raise').astype(int)
+                elif dtype is str:
+                    column = column.where(column.isna(),column.astype(str))
+                elif dtype is datetime:
+                    if 'timezone' in df.columns:
+                        timezone = df['timezone'].where(df['timezone'].notna(),None)
+                    elif 'timezone' in fields and fields['timezone'].default is not MISSING:
+                        timezone = fields['timezone'].default
+                    else:
+                        timezone = None
+                    column = pd.Series(coerceDatetimes(column,timezone),index=column.index,dtype=object)
+            except (ValueError,TypeError):
+                # Leave the column as is, values will be coerced (or rejected) per instance
+                pass
+            # Missing values are passed as None, which always pass type checks
+            columns[name] = column.astype(object).where(column.notna(),None)
+        records = pd.DataFrame(columns,index=df.index).to_dict(orient='records')
+        return(cls.from_records(records,generator=generator))
         
     @classmethod
-    def from_yaml(cls,fpath,kwargs={},kwargOverwrite=False):
+    def from_yaml(cls,fpath,kwargs={},kwargOverwrite=False,cache=None):
         # if 'debug' in kwargs and kwargs['debug']:
         if kwargOverwrite:
-            env = cls.loadDict(None,fileName=fpath)|kwargs
+            env = cls.loadDict(None,fileName=fpath,cache=cache)|kwargs
         else:
-            env = kwargs|cls.loadDict(None,fileName=fpath)
+            env = kwargs|cls.loadDict(None,fileName=fpath,cache=cache)
         return(cls.from_dict(env))
 
+    # Load many yaml files concurrently (see dictFuncs.loadMany), instances are constructed in input order
+    # Returns (instances,errors), instances is None for files which failed to load or construct
+    @classmethod
+    def from_yaml_many(cls,fpaths,kwargs={},kwargOverwrite=False,workers=None,executor='process',cache=None):
+        fpaths = list(fpaths)
+        envs,errors = cls.loadMany(None,fpaths,workers=workers,executor=executor,cache=cache)
+        instances = []
+        for fpath,env in zip(fpaths,envs):
+            if env is None:
+                instances.append(None)
+                continue
+            try:
+                instances.append(cls.from_dict(env|kwargs if kwargOverwrite else kwargs|env))
+            except (Exception,SystemExit) as e:
+                errors[fpath] = f'{type(e).__name__}: {e}'
+                instances.append(None)
+        return(instances,errors)
+
     @classmethod
     def metadataMap(cls,description,options=None):
         # Streamline the creation of metadata in dataclass fields by formatting a standardized dict
@@ -112,10 +227,9 @@ class baseClassMethods(dictFuncs):
     
     @classmethod
     def template(cls,kwargs={}):
-        signature = inspect.signature(cls.__init__)
-        for param in signature.parameters.values():
-            if param.name not in ['self'] and param.default is param.empty:
-                kwargs[param.name] = param.name
+        from ruamel.yaml.comments import CommentedMap
+        for name in cls.classMetadata().requiredArgs:
+            kwargs[name] = name
         #hiddenDefaults implicit to baseclass
         kwargs = kwargs | {'typeCheck':False,'readOnly':True,'fromFile':False}
         template = cls.from_dict(kwargs)
@@ -158,10 +272,22 @@ class baseClassMethods(dictFuncs):
         Name = os.path.split(template)[-1].replace('.yml','')
         if base is None:
             base = (baseClassMethods,)
-        return(make_dataclass(Name,flds,bases=base,kw_only=True))
+        out = make_dataclass(Name,flds,bases=base,kw_only=True)
+        out.registerClass()
+        return(out)
 
 class baseFunctions(baseClassMethods):
-    
+    __slots__ = ()
+
+    # Transient per-instance state which isn't a dataclass field (held warnings, auxargs, dirty tracking)
+    # Kept in __dict__ so it is also available as attributes, compactDataClass keeps it in a side slot
+    # Direct instances of the (slotted) helper bases, eg. baseFunctions(), have nowhere to keep it
+    def transientState(self):
+        try:
+            return(self.__dict__)
+        except AttributeError:
+            return({})
+
     def normpath(self,path):
         if os.name == 'nt':
             return os.path.normpath(path)
@@ -173,20 +299,27 @@ class baseFunctions(baseClassMethods):
             verbose = self.verbose
         else:
             verbose = True
-        out = log(msg=f'\n\n{"*"*11} Error {"*"*11}\n{msg}\n{"*"*10} Exiting {"*"*10}\n',traceback=traceback,kill=kill,cf=currentframe(),verbose=verbose)
+        if not kill and not (verbose and isEnabledFor('ERROR')):
+            return
+        out = log(msg=f'\n\n{"*"*11} Error {"*"*11}\n{msg}\n{"*"*10} Exiting {"*"*10}\n',traceback=traceback,kill=kill,cf=currentframe(),verbose=verbose,level='ERROR')
 
     def logWarning(self,msg='',hold=False,traceback=False,verbose=None):
         if verbose is None and hasattr(self,'verbose'):
             verbose = self.verbose
         else:
             verbose = True
-        if not hasattr(self,'message') or self.message == '':
-            self.message = msg
+        # Dropped warnings skip the join/format work, held messages are still accumulated
+        if not hold and not (verbose and isEnabledFor('WARNING')):
+            self.transientState()['message'] = ''
+            return
+        transient = self.transientState()
+        if transient.get('message','') == '':
+            transient['message'] = msg
         else:
-            self.message = '\n'.join([self.message, msg])
+            transient['message'] = '\n'.join([transient['message'], msg])
         if not hold:
-            out = log(msg=f'{"*"*10} Warning {"*"*10}\n{self.message}\n',traceback=traceback,cf=currentframe(),verbose=verbose)
-            self.message = ''
+            out = log(msg=f'{"*"*10} Warning {"*"*10}\n{transient["message"]}\n',traceback=traceback,cf=currentframe(),verbose=verbose,level='WARNING')
+            transient['message'] = ''
 
     def logChoice(self,msg,proceed='Y',kill=False):
         out = log(msg=msg,cf=currentframe(),verbose=True)
@@ -203,47 +336,91 @@ class baseFunctions(baseClassMethods):
             verbose = self.verbose
         else:
             verbose = True
+        if not (verbose and isEnabledFor('INFO')):
+            return
         out = log(f"{msg}",traceback=traceback,verbose=verbose,cf=currentframe())
 
     def currentTimeString(self=None,fmt='%Y-%m-%dT%H:%M:%SZ'):
         return(datetime.now(timezone.utc).strftime(fmt))
     
+    # ISO-8601 and known formats are parsed directly (see datetimeParser.py)
+    # Warnings are only raised when falling back to dateparser
+    @timed(fieldArg=0)
     def parseDatetime(self,name,value):
-        if hasattr(self,'timezone'):
-            kwargs = {'DATE_ORDER':'YMD','RETURN_AS_TIMEZONE_AWARE':True,'TIMEZONE':str(ZoneInfo(getattr(self,'timezone')))}
-        else:
-            kwargs = {'DATE_ORDER':'YMD','RETURN_AS_TIMEZONE_AWARE':False}
-        self.logWarning(f'The datetime object {name}:{value} will be parsed as with: {kwargs}',hold=True)
-        setattr(self,name,dateparser.parse(value,settings=kwargs))
-        self.logWarning(f'Confirm variable coerced correctly: {getattr(self,name)}')
+        timezone = getattr(self,'timezone') if hasattr(self,'timezone') else None
+        parsed,fallback = coerceDatetime(value,timezone)
+        if fallback:
+            self.logWarning(f'The datetime object {name}:{value} will be parsed as with: {dateparserSettings(timezone)}',hold=True)
+        setattr(self,name,parsed)
+        if fallback:
+            self.logWarning(f'Confirm variable coerced correctly: {getattr(self,name)}')
 
 
 # Dataclass with no fields for automatic type enforcement (with simple coercsion by default)
 @dataclass
 class typeEnforcer(baseFunctions):
+    __slots__ = ()
 
+    @timed
     def __post_init__(self):
         if not hasattr(self,'typeEnforce'):
             self.checkType()
 
+    @timed
     def checkType(self):
-        fieldValues = self.__dataclass_fields__
         if hasattr(self,'typeCoercion') and self.typeCoercion:
             coerceMethod = 'full'
         else:
             coerceMethod = 'simple'
-        # Dump fields to tuple (name,dtype,value,default) for if they fail checks
-        attributes = [
-            (key,value.type,getattr(self,key,None),value.default if value.default is not MISSING else value.default_factory)
-            for key,value in fieldValues.items() if not (
-                getattr(self,key,None) is None or # None's pass
-                inspect.isclass(value.type) and isinstance(getattr(self,key,None),value.type) or # Matching types pass 
-                value.type is Iterable and isinstance(getattr(self,key,None),Iterable) or # Iterables pass
-                value.type is callable and (getattr(self,key,None) is callable or dataclasses.is_dataclass(getattr(self,key,None))) # Callables pass (in some cases)
-            )]
-        for name,dtype,value,default in attributes:
+        for name,check,coerce in self.typeCheckPlan():
+            value = getattr(self,name,None)
+            if not check(value):
+                coerce(self,coerceMethod,value)
+
+    # Per-class validation plan of (name, checker, coercer) closures
+    # Built on first instantiation and cached on the class, so later instances skip the reflection
+    @classmethod
+    def typeCheckPlan(cls):
+        plan = cls.__dict__.get('_typeCheckPlan')
+        if plan is None:
+            plan = [
+                (key,cls.typeChecker(value.type),cls.typeCoercer(key,value.type,value.default if value.default is not MISSING else value.default_factory))
+                for key,value in cls.__dataclass_fields__.items()]
+            cls._typeCheckPlan = plan
+        return(plan)
+
+    @classmethod
+    def clearTypeCheckPlan(cls):
+        if '_typeCheckPlan' in cls.__dict__:
+            del cls._typeCheckPlan
+
+    @classmethod
+    def invalidateClassMetadata(cls):
+        super().invalidateClassMetadata()
+        cls.clearTypeCheckPlan()
+
+    @staticmethod
+    def typeChecker(dtype):
+        # None's pass in all cases
+        if inspect.isclass(dtype):
+            # Matching types pass
+            return(lambda value: value is None or type(value) is dtype or isinstance(value,dtype))
+        elif dtype is Iterable:
+            # Iterables pass
+            return(lambda value: value is None or isinstance(value,Iterable))
+        elif dtype is callable:
+            # Callables pass (in some cases)
+            return(lambda value: value is None or value is callable or dataclasses.is_dataclass(value))
+        else:
+            return(lambda value: value is None)
+
+    @staticmethod
+    def typeCoercer(name,dtype,default):
+        def coerce(self,coerceMethod,value):
             self.coerceType(coerceMethod,name,dtype,value,default)
-                
+        return(coerce)
+
+    @timed(fieldArg=1)
     def coerceType(self,coerceMethod,name,dtype,value,default=None):
         # Simple cases
         if dtype in [bool,str,int,float]:
@@ -272,8 +449,184 @@ class typeEnforcer(baseFunctions):
             self.logError(f'Type check failed in {type(self)}: {name} of type {dtype}',traceback=True)
 
 
+# Methods shared by baseDataClass and compactDataClass
 @dataclass
-class baseDataClass(typeEnforcer):
+class dataClassMethods(typeEnforcer):
+    __slots__ = ()
+
+    @timed
+    def checkOptions(self):
+        # Dump fields to tuple (name,value,options) for if they fail checks
+        attributes = [
+            (key,getattr(self,key),options) for key,options in self.classMetadata().options.items() if not (
+                getattr(self,key) is None or # None's pass
+                getattr(self,key) in options # Has options which are satisfied
+                )]
+        if len(attributes) == 0:
+            return
+        for name,value,options in attributes:
+            # self.logMessage(f'{name}: {value} is invalid, must be one of {options}')
+            self.logError(f'Update parameters to meet required options:\n{name}: {value} is invalid, must be one of {options}')
+
+    # Columnar container for many records of this class (see columnar.py)
+    # records: iterable of dicts or instances, or columns: {field: values}
+    @classmethod
+    def Table(cls,records=None,columns=None,validate=True):
+        from .columnar import table
+        return(table(cls,records=records,columns=columns,validate=validate))
+
+    def to_dict(self,repr=True,inheritance=True,keepNull=True,sorted=False,onlyID=False,debug=False,cycles='error'):
+        if onlyID == True:
+            data = {key:getattr(self,key) for key in self.requiredArgs()} 
+        else:
+            data = dictFuncs().serialize(self,repr=repr,inheritance=inheritance,keepNull=keepNull,sorted=sorted,cycles=cycles)
+        return(data)
+
+    # Field level dirty tracking, fields are compared against the values they held at the last saveConfigFile
+    # (identity, then equality), so construction and assignment carry no overhead
+    # Before the first save every field counts as dirty
+    # list, dict and set values are saved as shallow copies, so in place changes to them are seen (changes deeper inside them aren't, flag those with markDirty)
+    def markDirty(self,*names):
+        self.transientState().setdefault('_dirtyFields',set()).update(names if names else self.__dataclass_fields__)
+
+    # Names of modified fields, including fields holding nested baseDataClass objects with modified fields
+    # seen: results by object id, objects still being checked count as clean so cyclic graphs terminate
+    def dirtyFields(self,seen=None):
+        transient = self.transientState()
+        saved = transient.get('_savedValues')
+        if saved is None:
+            return(set(self.__dataclass_fields__))
+        seen = {} if seen is None else seen
+        seen[id(self)] = set()
+        dirty = set(transient.get('_dirtyFields',()))
+        for name in self.__dataclass_fields__:
+            value = getattr(self,name,None)
+            if not unchanged(value,saved.get(name)):
+                dirty.add(name)
+            elif isinstance(value,dataClassMethods) and (seen[id(value)] if id(value) in seen else value.dirtyFields(seen)):
+                dirty.add(name)
+        seen[id(self)] = dirty
+        return(dirty)
+
+    def clearDirty(self,seen=None):
+        seen = set() if seen is None else seen
+        seen.add(id(self))
+        transient = self.transientState()
+        transient['_dirtyFields'] = set()
+        transient['_savedValues'] = {name:savedValue(getattr(self,name,None)) for name in self.__dataclass_fields__}
+        for name in self.__dataclass_fields__:
+            value = transient['_savedValues'][name]
+            if isinstance(value,dataClassMethods) and id(value) not in seen:
+                value.clearDirty(seen)
+
+    # asynchronous: queue the save on the background writer (see dictFuncs.saveDictAsync) instead of blocking
+    # incremental: skip the write if no fields changed since the last save to this path
+    #   yaml files are kept as a round-trip CommentedMap, and only modified keys are patched (preserving comments and header)
+    # Returns False if the write was skipped
+    def saveConfigFile(self,configFilePath,repr=True,inheritance=True,keepNull=True,header=None,sorted=False,debug=False,asynchronous=False,incremental=False,fsync=False):
+        if incremental:
+            return(self.saveConfigFileIncremental(configFilePath,repr=repr,inheritance=inheritance,keepNull=keepNull,header=header,sorted=sorted,asynchronous=asynchronous,fsync=fsync))
+        self.setLastModified()
+        configDict = self.to_dict(repr=repr,inheritance=inheritance,keepNull=keepNull,sorted=sorted,debug=debug)
+        if asynchronous:
+            self.saveDictAsync(configDict,fileName=configFilePath,header=header,fsync=fsync)
+        else:
+            self.saveDict(configDict,fileName=configFilePath,header=header,fsync=fsync)
+        self.clearDirty()
+        self.transientState()['_savedConfig'] = None
+        return(True)
+
+    def saveConfigFileIncremental(self,configFilePath,repr=True,inheritance=True,keepNull=True,header=None,sorted=False,asynchronous=False,fsync=False):
+        configFilePath = os.path.abspath(configFilePath)
+        saved = self.transientState().get('_savedConfig')
+        options = (repr,inheritance,keepNull,sorted)
+        exists = os.path.isfile(configFilePath)
+        stat = (os.stat(configFilePath).st_mtime_ns,os.stat(configFilePath).st_size) if exists else None
+        # The previous save is only reusable if it was to the same (unmodified) file with the same options
+        current = saved is not None and saved['path'] == configFilePath and saved['options'] == options and (saved['stat'] == stat or saved['pending'])
+        dirty = self.dirtyFields() - {'lastModified'}
+        if current and not dirty:
+            return(False)
+        isYAML = configFilePath.endswith('.yml') or configFilePath.endswith('.yaml')
+        self.setLastModified()
+        if 'lastModified' in self.__dataclass_fields__:
+            dirty.add('lastModified')
+        if isYAML and (current or exists):
+            if current:
+                document,fileHeader = saved['document'],saved['header']
+            else:
+                document,fileHeader = self.loadDict(configFilePath,returnHeader=True,preserveComments=True,cache=False)
+                dirty = set(self.__dataclass_fields__)
+            keys = set(fieldPlan(type(self),repr,inheritance,keepNull,1,1))
+            for key in dirty:
+                value = getattr(self,key,None)
+                if key not in keys or (not keepNull and value is None):
+                    document.pop(key,None)
+                else:
+                    document[key] = dictFuncs().serialize(value,repr=repr,inheritance=inheritance,keepNull=keepNull,sorted=sorted)
+            if header is None:
+                header = fileHeader
+        else:
+            document = self.to_dict(repr=repr,inheritance=inheritance,keepNull=keepNull,sorted=sorted)
+            if isYAML:
+                from ruamel.yaml.comments import CommentedMap
+                document = CommentedMap(document)
+        if asynchronous:
+            self.saveDictAsync(document,fileName=configFilePath,header=header,fsync=fsync)
+        else:
+            self.saveDict(document,fileName=configFilePath,header=header,fsync=fsync)
+        self.clearDirty()
+        self.transientState()['_savedConfig'] = {
+            'path':configFilePath,
+            'options':options,
+            'document':document if isYAML else None,
+            'header':header,
+            'stat':None if asynchronous else (os.stat(configFilePath).st_mtime_ns,os.stat(configFilePath).st_size),
+            'pending':asynchronous,
+            }
+        return(True)
+
+    # Stored as a field if the class has one, otherwise as transient state
+    def setLastModified(self):
+        if 'lastModified' in self.__dataclass_fields__:
+            self.lastModified = self.currentTimeString()
+        else:
+            self.transientState()['lastModified'] = self.currentTimeString()
+
+    # Binary snapshots (see snapshot.py), lossless for datetimes, nested dataclasses and arrays
+    def to_bytes(self):
+        state = {key:getattr(self,key) for key in self.__dataclass_fields__ if hasattr(self,key)}
+        return(snapshot.packSnapshot(type(self),state))
+
+    # Validates the schema and field types, but skips __post_init__ (loading configFile, coercion and option checks)
+    @classmethod
+    def from_bytes(cls,data):
+        try:
+            header,state = snapshot.unpackSnapshot(data)
+        except (ValueError,pickle.UnpicklingError) as e:
+            log(f'Could not read snapshot for {cls.__name__}: {e}',kill=True)
+        if header['fields'] != snapshot.schema(cls):
+            mismatch = {k for k in header['fields'].keys()|snapshot.schema(cls).keys() if header['fields'].get(k) != snapshot.schema(cls).get(k)}
+            log(f'Snapshot of {header["class"]} does not match the schema of {cls.__name__}: {sorted(mismatch)}',kill=True)
+        out = cls.__new__(cls)
+        for key,value in state.items():
+            object.__setattr__(out,key,value)
+        if hasattr(cls,'typeCheckPlan'):
+            failed = [name for name,check,coerce in cls.typeCheckPlan() if name in state and not check(state[name])]
+            if failed:
+                log(f'Snapshot of {cls.__name__} failed type checks: {failed}',kill=True)
+        return(out)
+
+    def saveSnapshot(self,fileName,atomic=True,fsync=False):
+        writeFile(fileName,self.to_bytes(),atomic=atomic,fsync=fsync)
+
+    # useMmap: arrays are read-only views into the memory mapped file instead of being read into memory
+    @classmethod
+    def loadSnapshot(cls,fileName,useMmap=False):
+        return(cls.from_bytes(snapshot.readSnapshot(fileName,useMmap=useMmap)))
+
+@dataclass
+class baseDataClass(dataClassMethods):
     verbose: bool = field(default=True,repr=False) # Enable verbose output for type coercion warnings
     typeEnforce: bool = field(default=True,repr=False) # Enable type enforcement
     typeCoercion: bool = field(default=True,repr=False) # Enable type coercion if fails type check
@@ -281,6 +634,7 @@ class baseDataClass(typeEnforcer):
     debug: bool = field(default=False,repr=False) # Allows embedding of conditional debug statements
     configFile: dict = field(default=None,repr=False)
 
+    @timed
     def __post_init__(self):
         if isinstance(self.configFile,str) and os.path.isfile(self.configFile):
             self.configFile = self.loadDict(self.configFile)
@@ -290,32 +644,81 @@ class baseDataClass(typeEnforcer):
             self.checkOptions()
         super().__post_init__()
 
-    def checkOptions(self):
-        fields = {k:v for k,v in self.__dataclass_fields__.items() if v.init}
-        # Dump fields to tuple (name,dtype,value,default) for if they fail checks
-        attributes = [
-            (key,getattr(self,key),value.metadata['options']) for key,value in fields.items() if not any(
-                [getattr(self,key) is None, # None's pass
-                'options' not in value.metadata, # Has no options
-                'options' in value.metadata and getattr(self,key) in value.metadata['options'], # Has options which are satisfied
-                ])]
-        if len(attributes) == 0:
-            return
-        for name,value,options in attributes:
-            # self.logMessage(f'{name}: {value} is invalid, must be one of {options}')
-            self.logError(f'Update parameters to meet required options:\n{name}: {value} is invalid, must be one of {options}')
 
-    def to_dict(self,repr=True,inheritance=True,keepNull=True,sorted=False,onlyID=False,debug=False):
-        if onlyID == True:
-            data = {key:self.__dict__[key] for key in self.requiredArgs()} 
-        else:
-            data = dictFuncs().dcToDict(self,repr=repr,inheritance=inheritance,keepNull=keepNull,sorted=sorted,debug=debug)
-        return(data)
+# Compact alternative to baseDataClass for holding many records in memory
+# * Subclasses are slotted dataclasses (use the slotted decorator), so instances have no __dict__
+# * verbose, typeEnforce, typeCoercion, optionEnforce and debug are class level policy instead of per-instance fields, there is no configFile field
+# * Transient attributes (held warning messages, auxargs, dirty tracking) live in a single side slot that is only created when used
+#   and can still be read as attributes, eg. obj.auxargs
+# Note: zero argument super() doesn't work in methods of slotted dataclasses, call the base method explicitly
+@dataclass
+class compactDataClass(dataClassMethods):
+    __slots__ = ('_transient',)
+    verbose = True
+    typeEnforce = True
+    typeCoercion = True
+    optionEnforce = True
+    debug = False
 
-    def saveConfigFile(self,configFilePath,repr=True,inheritance=True,keepNull=True,header=None,sorted=False,debug=False):
-        self.lastModified = self.currentTimeString()
-        configDict = self.to_dict(repr=repr,inheritance=inheritance,keepNull=keepNull,sorted=sorted,debug=debug)
-        self.saveDict(configDict,fileName=configFilePath,header=header)
+    @timed
+    def __post_init__(self):
+        if self.typeEnforce:
+            self.checkType()
+        if self.optionEnforce:
+            self.checkOptions()
+
+    def transientState(self):
+        try:
+            return(self._transient)
+        except AttributeError:
+            self._transient = {}
+            return(self._transient)
+
+    # Only called for missing attributes, so field access isn't affected
+    def __getattr__(self,name):
+        if name != '_transient':
+            try:
+                transient = self._transient
+            except AttributeError:
+                transient = None
+            if transient and name in transient:
+                return(transient[name])
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+policyFlags = ['verbose','typeEnforce','typeCoercion','optionEnforce','debug']
+
+# Class decorator for compactDataClass subclasses, generates a slotted dataclass and sets the class level policy
+# @slotted(typeCoercion=False)
+# class site(compactDataClass):
+#     name: str = None
+def slotted(cls=None,kw_only=True,**policy):
+    def wrap(cls):
+        if not issubclass(cls,compactDataClass):
+            log(f'{cls.__name__} must inherit from compactDataClass to be slotted',kill=True)
+        unknown = set(policy)-set(policyFlags)
+        if unknown:
+            log(f'Invalid policy for {cls.__name__}: {sorted(unknown)}, must be in {policyFlags}',kill=True)
+        for key,value in policy.items():
+            setattr(cls,key,value)
+        out = dataclass(cls,kw_only=kw_only,slots=True)
+        out.registerClass()
+        return(out)
+    if cls is None:
+        return(wrap)
+    return(wrap(cls))
+
+# Used for dirty tracking, values which can't be compared (e.g. arrays) count as changed
+def savedValue(value):
+    if type(value) in (list,dict,set):
+        return(copy.copy(value))
+    return(value)
 
+def unchanged(a,b):
+    if a is b:
+        return(True)
+    try:
+        return(bool(a == b))
+    except Exception:
+        return(False)
 
 mdMap = baseClassMethods.metadataMap
\ No newline at end of file
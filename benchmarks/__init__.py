@@ -0,0 +1,3 @@
+# Microbenchmarks for helperFunctions
+# Run from the directory containing the package, e.g.:
+# python -m helperFunctions.benchmarks.coordinates
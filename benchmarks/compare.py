@@ -0,0 +1,46 @@
+# Compare benchmark results against a stored baseline, exits with 1 if any case is slower (or uses more memory) than the threshold
+# python -m helperFunctions.benchmarks.compare [--current results.json] [--baseline path] [--threshold 1.25]
+# Without --current the suite is run first (with the same quick setting as the baseline)
+# The stored baseline is machine specific, regenerate it with benchmarks.suite --output when moving to new hardware
+import os
+import sys
+import json
+from ..cmdParse import cmdParse
+from . import suite
+
+defaultBaseline = os.path.join(os.path.dirname(os.path.abspath(__file__)),'baseline.json')
+
+def compare(current,baseline,threshold=1.25,memoryThreshold=1.1,verbose=True):
+    regressions = []
+    for metric,limit,unit,factor in [('seconds',threshold,'us/op',1e6),('bytesPerInstance',memoryThreshold,'bytes',1)]:
+        for name,value in current[metric].items():
+            if name not in baseline[metric]:
+                if verbose:
+                    print(f'{name:<32}{value*factor:14.2f} {unit:<6}  (not in baseline)')
+                continue
+            ratio = value/baseline[metric][name]
+            flag = ratio > limit
+            if flag:
+                regressions.append((name,ratio))
+            if verbose:
+                print(f'{name:<32}{value*factor:14.2f} {unit:<6}{baseline[metric][name]*factor:14.2f} {unit:<6}{ratio:8.2f}x{"  SLOWER" if flag else ""}')
+    return(regressions)
+
+def run(current=None,baseline=defaultBaseline,threshold=1.25,memoryThreshold=1.1,repeat=5):
+    with open(baseline) as f:
+        baseline = json.load(f)
+    if current is None:
+        current = suite.run(quick=baseline['quick'],repeat=repeat,verbose=False)
+    else:
+        with open(current) as f:
+            current = json.load(f)
+    if current['quick'] != baseline['quick']:
+        print('Warning: comparing quick and full runs')
+    regressions = compare(current,baseline,threshold,memoryThreshold)
+    if regressions:
+        print(f'\n{len(regressions)} regression(s) beyond {threshold}x (memory {memoryThreshold}x): {", ".join(name for name,ratio in regressions)}')
+    return(regressions)
+
+if __name__ == '__main__':
+    args = cmdParse({'current':None,'baseline':defaultBaseline,'threshold':1.25,'memoryThreshold':1.1,'repeat':5})
+    sys.exit(1 if run(**args) else 0)
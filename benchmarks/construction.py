@@ -0,0 +1,57 @@
+# Per-instance construction cost of baseDataClass records, comparing the cached type check plan
+# against the original per-instance reflection in typeEnforcer.checkType
+import inspect
+import timeit
+import dataclasses
+from dataclasses import dataclass, field, MISSING
+from typing import Iterable
+from ..baseClass import baseDataClass
+
+@dataclass(kw_only=True)
+class record(baseDataClass):
+    name: str = None
+    height: float = 1.0
+    count: int = 0
+    enabled: bool = True
+    tags: list = field(default_factory=list)
+    kind: str = field(default='a',metadata={'options':['a','b','c']})
+
+# Original implementation of typeEnforcer.checkType, kept here as the reference
+def legacyCheckType(self):
+    fieldValues = self.__dataclass_fields__
+    if hasattr(self,'typeCoercion') and self.typeCoercion:
+        coerceMethod = 'full'
+    else:
+        coerceMethod = 'simple'
+    attributes = [
+        (key,value.type,getattr(self,key,None),value.default if value.default is not MISSING else value.default_factory)
+        for key,value in fieldValues.items() if not (
+            getattr(self,key,None) is None or
+            inspect.isclass(value.type) and isinstance(getattr(self,key,None),value.type) or
+            value.type is Iterable and isinstance(getattr(self,key,None),Iterable) or
+            value.type is callable and (getattr(self,key,None) is callable or dataclasses.is_dataclass(getattr(self,key,None)))
+        )]
+    for name,dtype,value,default in attributes:
+        self.coerceType(coerceMethod,name,dtype,value,default)
+
+@dataclass(kw_only=True)
+class legacyRecord(record):
+    def checkType(self):
+        legacyCheckType(self)
+
+def run(n=20000,repeat=5):
+    cases = {
+        'valid types':{'name':'x','height':2.5,'count':3,'enabled':False,'kind':'b'},
+        'coerced types':{'name':'x','height':'2.5','count':'3','enabled':1,'kind':'b'},
+    }
+    for label,kwargs in cases.items():
+        for cls in [legacyRecord,record]:
+            t = min(timeit.repeat(lambda: cls(**kwargs),number=n,repeat=repeat))
+            print(f'{label:<16}{cls.__name__:<16}{t*1e6/n:10.2f} us/instance')
+    for cls in [legacyRecord,record]:
+        obj = cls(**cases['valid types'])
+        t = min(timeit.repeat(obj.checkType,number=n,repeat=repeat))
+        print(f'{"checkType only":<16}{cls.__name__:<16}{t*1e6/n:10.2f} us/call')
+
+if __name__ == '__main__':
+    run()
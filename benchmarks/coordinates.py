@@ -0,0 +1,50 @@
+# Compare the compiled/memoized degree parser against the original getDD implementation
+import re
+import random
+import timeit
+from ..parseCoordinates import geographicCoordinates, parseDegrees, cachedParseDegrees
+
+# Original implementation of geographicCoordinates.getDD, kept here as the reference
+def legacyGetDD(value,hemisphere,DD_sig=7,DDM_sig=5,DMS_sig=1,degreeString='°'):
+    value = re.sub(r'\b(\d+)S\b|\bS\b|\bS(\d+)\b', r'-\1\2', value)
+    value = re.sub(r'\b(\d+)W\b|\bW\b|\bW(\d+)\b', r'-\1\2', value)
+    value = re.sub(r'[^0-9,.-]+',',',value)
+    value = value.replace(',,',',')
+    if '-' in value:
+        sign = -1
+        hemisphere = hemisphere[1]
+    else:
+        sign = 1
+        hemisphere = hemisphere[0]
+    value = value.replace('-','')
+    value = [sign*float(v) for v in value.split(',') if len(v)>0]
+    DD = round(sum([l*m for l,m in zip(value,[1,1/60,1/3600])]),DD_sig)
+    DDM = hemisphere+str(int(abs(DD)))+degreeString+' '+str(round((DD%1)*60,DDM_sig))+"`"
+    DMS = hemisphere+str(int(abs(DD)))+degreeString+' '+str(int((DD%1)*60))+"' "+str(round((DD%1*60)%1*60,DMS_sig))+'"'
+    return(DD,DDM,DMS)
+
+def sampleStrings(n=1000,unique=100,seed=0):
+    rng = random.Random(seed)
+    pool = []
+    for i in range(unique):
+        d,m,s = rng.randint(0,89),rng.randint(0,59),round(rng.uniform(0,60),1)
+        pool.append(rng.choice([f'{d}.{m:02d}{int(s)}',f'{d} {m+s/60:.3f}N',f'{d}°{m:02d}\'{s}"S',f'-{d} {m} {s}']))
+    return([rng.choice(pool) for i in range(n)])
+
+def run(n=10000,unique=100,repeat=5):
+    values = sampleStrings(n,unique)
+    cases = {
+        'legacy getDD':lambda: [legacyGetDD(v,'NS') for v in values],
+        'parseDegrees (DD+DDM+DMS)':lambda: [(p.DD,p.DDM,p.DMS) for p in (parseDegrees(v,'NS') for v in values)],
+        'parseDegrees (DD only)':lambda: [parseDegrees(v,'NS').DD for v in values],
+        'cachedParseDegrees (DD only)':lambda: [cachedParseDegrees(v,'NS').DD for v in values],
+        'geographicCoordinates':lambda: [geographicCoordinates(latitude=v,longitude=v) for v in values],
+        'geographicCoordinates lazy':lambda: [geographicCoordinates(latitude=v,longitude=v,lazy=True) for v in values],
+    }
+    print(f'{n} strings, {unique} unique')
+    for name,fn in cases.items():
+        t = min(timeit.repeat(fn,number=1,repeat=repeat))
+        print(f'{name:<32}{t*1e6/n:10.2f} us/value')
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,54 @@
+# Benchmarks for merging into and building large nested dicts
+import copy
+from ..dictFuncs import dictFuncs
+from .generators import makePaths
+from .suite import bestTime
+
+# Original implementation of dictFuncs.updateDict (deep copy at every recursion level), kept here as the reference
+# Only the branches exercised by the benchmark are reproduced
+def legacyUpdateDict(base,new,overwrite=False):
+    base = copy.deepcopy(base)
+    if base == new: return(base)
+    for key,value in new.items():
+        if type(base) is dict and key not in base.keys():
+            str(base) # message formatting in log() happened even with verbose=False
+            base[key]=value
+        elif type(value) is dict and type(base[key]) is dict:
+            base[key] = legacyUpdateDict(base[key],value,overwrite)
+        elif overwrite == True and base[key]!= value:
+            base[key] = value
+    return(base)
+
+# Original packDict merge loop (order=-1, no limit), one deep copying merge per path
+def legacyPackDict(itemList,format='/'):
+    Tree = {}
+    for key in itemList:
+        subTree = key
+        for part in key.split(format)[::-1]:
+            subTree = {part:subTree}
+        Tree = legacyUpdateDict(Tree,subTree)
+    return(Tree)
+
+def run(sizes=[2000,10000,100000],legacyLimit=2000):
+    df = dictFuncs()
+    override = {'k1':{'k2':{'k3':{'new':1}}}}
+    for n in sizes:
+        paths = makePaths(n)
+        if n <= legacyLimit:
+            t = bestTime(lambda: legacyPackDict(paths),1,repeat=1)
+            print(f'{n:>7} keys  packDict legacy{"":<10}{t*1e3:10.1f} ms')
+        t = bestTime(lambda: df.packDict(paths,format='/',fill='key'),1,repeat=3)
+        print(f'{n:>7} keys  packDict{"":<18}{t*1e3:10.1f} ms')
+        tree = df.packDict(paths,format='/',fill='key')
+        if n <= legacyLimit:
+            t = bestTime(lambda: legacyUpdateDict(tree,override,overwrite=True),1,repeat=3)
+            print(f'{n:>7} keys  updateDict legacy{"":<8}{t*1e3:10.3f} ms')
+        for mode in ['copy','shared']:
+            t = bestTime(lambda: df.updateDict(tree,override,overwrite=True,mode=mode),1,repeat=3)
+            print(f'{n:>7} keys  updateDict {mode:<15}{t*1e3:10.3f} ms')
+        trees = [copy.deepcopy(tree) for i in range(3)]
+        t = bestTime(lambda: df.updateDict(trees.pop(),override,overwrite=True,mode='inplace'),1,repeat=3)
+        print(f'{n:>7} keys  updateDict {"inplace":<15}{t*1e3:10.3f} ms')
+
+if __name__ == '__main__':
+    run()
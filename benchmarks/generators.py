@@ -0,0 +1,113 @@
+# Seeded synthetic data for the benchmark suite
+import random
+from dataclasses import dataclass, field
+from datetime import datetime
+from ..baseClass import baseDataClass, compactDataClass, slotted
+
+@dataclass(kw_only=True)
+class channel(baseDataClass):
+    name: str = None
+    units: str = field(default='m/s',metadata={'options':['m/s','degC','%']})
+    height: float = 1.0
+    frequency: str = '10Hz'
+
+@dataclass(kw_only=True)
+class site(baseDataClass):
+    name: str = None
+    latitude: float = None
+    longitude: float = None
+    elevation: float = 0.0
+    enabled: bool = True
+    start: datetime = None
+    tags: list = field(default_factory=list)
+    sensor: channel = field(default_factory=channel)
+
+# Same records as slotted compactDataClass subclasses
+@slotted
+class compactChannel(compactDataClass):
+    name: str = None
+    units: str = field(default='m/s',metadata={'options':['m/s','degC','%']})
+    height: float = 1.0
+    frequency: str = '10Hz'
+
+@slotted
+class compactSite(compactDataClass):
+    name: str = None
+    latitude: float = None
+    longitude: float = None
+    elevation: float = 0.0
+    enabled: bool = True
+    start: datetime = None
+    tags: list = field(default_factory=list)
+    sensor: compactChannel = field(default_factory=compactChannel)
+
+def siteKwargs(n,coerce=False,seed=0):
+    rng = random.Random(seed)
+    out = []
+    for i in range(n):
+        kwargs = {
+            'name':f'site{i}',
+            'latitude':round(rng.uniform(-60,70),6),
+            'longitude':round(rng.uniform(-180,180),6),
+            'elevation':round(rng.uniform(0,3000),1),
+            'enabled':rng.random() > .5,
+            'tags':['a','b'],
+            }
+        if coerce:
+            kwargs |= {
+                'elevation':str(kwargs['elevation']),
+                'enabled':int(kwargs['enabled']),
+                'start':f'2024-{rng.randrange(1,13):02d}-{rng.randrange(1,29):02d}T12:00:00',
+                'tags':'a',
+                'sensor':{'name':'ch0','units':'degC','height':'2.5'},
+                }
+        out.append(kwargs)
+    return(out)
+
+# Nested config with nSites entries of nChannels channels each
+def makeConfig(nSites=10,nChannels=10,seed=0):
+    rng = random.Random(seed)
+    return({f'site{s}':{
+        'name':f'Site {s}',
+        'latitude':round(rng.uniform(-90,90),6),
+        'longitude':round(rng.uniform(-180,180),6),
+        'enabled':rng.random() > .5,
+        'notes':'first line\nsecond line',
+        'channels':{f'ch{c}':{'units':rng.choice(['m/s','degC','%']),'height':rng.uniform(0,10),'tags':['a','b']} for c in range(nChannels)},
+        } for s in range(nSites)})
+
+# Unique '/' separated paths for packDict
+def makePaths(n,depth=4,width=10,seed=0):
+    rng = random.Random(seed)
+    paths = set()
+    while len(paths) < n:
+        paths.add('/'.join([f'k{rng.randrange(width)}' for d in range(depth-1)]+[f'leaf{len(paths)}']))
+    return(sorted(paths))
+
+# Mixed decimal degree, DDM and DMS coordinates
+def makeCoordinates(n,seed=0):
+    rng = random.Random(seed)
+    latitude,longitude = [],[]
+    for i in range(n):
+        lat,lon = rng.uniform(-60,70),rng.uniform(-180,180)
+        kind = i % 3
+        if kind == 0:
+            latitude.append(round(lat,6))
+            longitude.append(round(lon,6))
+        elif kind == 1:
+            latitude.append(f"{int(abs(lat))} {abs(lat)%1*60:.4f}'{'N' if lat >= 0 else 'S'}")
+            longitude.append(f"{int(abs(lon))} {abs(lon)%1*60:.4f}'{'E' if lon >= 0 else 'W'}")
+        else:
+            latitude.append(f"{int(abs(lat))}°{int(abs(lat)%1*60)}'{abs(lat)*3600%60:.2f}\"{'N' if lat >= 0 else 'S'}")
+            longitude.append(f"{int(abs(lon))}°{int(abs(lon)%1*60)}'{abs(lon)*3600%60:.2f}\"{'E' if lon >= 0 else 'W'}")
+    return(latitude,longitude)
+
+def makeFrequencies(n,seed=0):
+    rng = random.Random(seed)
+    units = ['Hz','MSEC','Sec','30 MIN','HR','T','Usec','1 sec','100 msec']
+    return([f'{rng.choice(["","every ","@ "])}{rng.randrange(1,60)} {rng.choice(units)}' for i in range(n)])
+
+def makeNames(n,seed=0):
+    rng = random.Random(seed)
+    pieces = ['Site','Tower #','Flux/','Met (old)','Soil-T','Ångström','  ','µmol']
+    return([f'{rng.choice(pieces)} {rng.randrange(1000)}{rng.choice(pieces)}' for i in range(n)])
@@ -0,0 +1,38 @@
+# Import time benchmark using python -X importtime
+# Guards against regressions: fails if heavy dependencies are pulled in by importing the core modules
+# or if the cumulative import time exceeds a threshold
+import os
+import sys
+import subprocess
+
+package = __package__.rsplit('.',1)[0]
+packageRoot = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+heavyModules = ['geopandas','pyproj','utm','dateparser','ruamel.yaml','pandas','numpy']
+
+def importTime(module):
+    result = subprocess.run(
+        [sys.executable,'-X','importtime','-c',f'import {module}'],
+        cwd=packageRoot,capture_output=True,text=True,check=True)
+    # Lines are formatted as: import time: self [us] | cumulative | imported package
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us,cumulative,name = line.replace('import time:','').split('|')
+        timings[name.strip()] = int(cumulative)
+    return(timings)
+
+def run(modules=['baseClass','dictFuncs'],threshold_ms=150,repeat=5):
+    failed = False
+    for module in modules:
+        name = f'{package}.{module}'
+        runs = [importTime(name) for i in range(repeat)]
+        best = min(timings[name] for timings in runs)/1000
+        loaded = [m for m in heavyModules if m in runs[0]]
+        print(f'{name:<32}{best:10.1f} ms  heavy imports: {loaded if loaded else "none"}')
+        if loaded or best > threshold_ms:
+            failed = True
+    return(failed)
+
+if __name__ == '__main__':
+    sys.exit(1 if run() else 0)
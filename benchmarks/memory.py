@@ -0,0 +1,27 @@
+# Memory per instance of baseDataClass vs slotted compactDataClass records with the same fields
+# Allocations are measured with tracemalloc (including nested records and field values), shallow sizes with sys.getsizeof
+import sys
+import tracemalloc
+from . import generators
+
+def allocated(cls,kwargs):
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    instances = [cls(**k) for k in kwargs]
+    out = (tracemalloc.get_traced_memory()[0]-start)/len(kwargs)
+    tracemalloc.stop()
+    return(out,instances[0])
+
+def shallow(obj):
+    return(sys.getsizeof(obj)+(sys.getsizeof(obj.__dict__) if hasattr(obj,'__dict__') else 0))
+
+def run(sizes=[10000,100000]):
+    for n in sizes:
+        kwargs = generators.siteKwargs(n)
+        for cls in [generators.site,generators.compactSite]:
+            perInstance,obj = allocated(cls,kwargs)
+            nested = shallow(obj.sensor)
+            print(f'{n:>7} {cls.__name__:<14}{perInstance:10.0f} bytes/instance allocated  {shallow(obj):6d} + {nested:4d} bytes shallow (record + sensor)  {perInstance*1e6/1e9:8.2f} GB per million')
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,210 @@
+# Benchmark suite for the package's hot paths, timings are the best of repeat runs in seconds per operation
+# Results are written to json and can be checked against a stored baseline with benchmarks.compare
+# python -m helperFunctions.benchmarks.suite --output results.json [--quick True] [--only construct]
+# python -m helperFunctions.benchmarks.suite --output helperFunctions/benchmarks/baseline.json to refresh the baseline
+import os
+import gc
+import json
+import time
+import platform
+import tempfile
+import tracemalloc
+from ..cmdParse import cmdParse
+from ..dictFuncs import dictFuncs
+from ..parseCoordinates import parseCoordinates, parseCoordinatesBatch
+from ..parseFrequency import parseFrequency
+from ..safeFormat import safeFormat, cleanString
+from . import generators
+
+cases = {}
+
+# Register a benchmark, the decorated function takes a scale factor and returns (fn, number of operations per call)
+def case(name):
+    def register(setup):
+        cases[name] = setup
+        return(setup)
+    return(register)
+
+# Garbage collection is disabled while timing (as in timeit) to reduce run to run noise
+def bestTime(fn,number,repeat):
+    best = None
+    for i in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            t = time.perf_counter()
+            fn()
+            t = time.perf_counter()-t
+        finally:
+            gc.enable()
+        best = t if best is None else min(best,t)
+    return(best/number)
+
+@case('construct.valid')
+def constructValid(scale):
+    kwargs = generators.siteKwargs(int(2000*scale))
+    return(lambda: [generators.site(**k) for k in kwargs],len(kwargs))
+
+@case('construct.coerced')
+def constructCoerced(scale):
+    kwargs = generators.siteKwargs(int(2000*scale),coerce=True)
+    return(lambda: [generators.site(**k) for k in kwargs],len(kwargs))
+
+@case('construct.noTypeEnforce')
+def constructUnchecked(scale):
+    kwargs = [k|{'typeEnforce':False,'optionEnforce':False} for k in generators.siteKwargs(int(2000*scale))]
+    return(lambda: [generators.site(**k) for k in kwargs],len(kwargs))
+
+@case('construct.compact')
+def constructCompact(scale):
+    kwargs = generators.siteKwargs(int(2000*scale))
+    return(lambda: [generators.compactSite(**k) for k in kwargs],len(kwargs))
+
+@case('from_dict')
+def fromDict(scale):
+    kwargs = [k|{'unused':1} for k in generators.siteKwargs(int(2000*scale))]
+    return(lambda: [generators.site.from_dict(k) for k in kwargs],len(kwargs))
+
+@case('from_records')
+def fromRecords(scale):
+    kwargs = generators.siteKwargs(int(2000*scale))
+    return(lambda: generators.site.from_records(kwargs),len(kwargs))
+
+@case('from_yaml')
+def fromYAML(scale):
+    fileName = os.path.join(tmp,'site.yml')
+    dictFuncs().saveDict(generators.siteKwargs(1,coerce=True)[0],fileName)
+    n = int(200*scale)
+    return(lambda: [generators.site.from_yaml(fileName,cache=False) for i in range(n)],n)
+
+@case('to_dict.nested')
+def toDict(scale):
+    sites = [generators.site(**k) for k in generators.siteKwargs(int(1000*scale),coerce=True)]
+    return(lambda: [s.to_dict() for s in sites],len(sites))
+
+@case('dcToDict.nested')
+def dcToDict(scale):
+    df = dictFuncs()
+    sites = [generators.site(**k) for k in generators.siteKwargs(int(1000*scale),coerce=True)]
+    return(lambda: [df.dcToDict(s) for s in sites],len(sites))
+
+@case('serialize.graph')
+def serializeGraph(scale):
+    df = dictFuncs()
+    graph = {'sites':[generators.site(**k) for k in generators.siteKwargs(int(1000*scale),coerce=True)],'config':generators.makeConfig(10,10)}
+    return(lambda: df.serialize(graph),1)
+
+@case('packDict')
+def packDict(scale):
+    df = dictFuncs()
+    paths = generators.makePaths(int(20000*scale))
+    return(lambda: df.packDict(paths,format='/',fill='key'),1)
+
+@case('unpackDict')
+def unpackDict(scale):
+    df = dictFuncs()
+    tree = df.packDict(generators.makePaths(int(20000*scale)),format='/',fill='key')
+    return(lambda: df.unpackDict(tree,format='/'),1)
+
+@case('updateDict.copy')
+def updateDictCopy(scale):
+    df = dictFuncs()
+    tree = df.packDict(generators.makePaths(int(20000*scale)),format='/',fill='key')
+    override = {'k1':{'k2':{'k3':{'new':1}}}}
+    return(lambda: df.updateDict(tree,override,overwrite=True),1)
+
+@case('updateDict.shared')
+def updateDictShared(scale):
+    df = dictFuncs()
+    tree = df.packDict(generators.makePaths(int(20000*scale)),format='/',fill='key')
+    override = {'k1':{'k2':{'k3':{'new':1}}}}
+    return(lambda: df.updateDict(tree,override,overwrite=True,mode='shared'),1)
+
+def ioCase(name,extension,nSites,nChannels,load):
+    @case(f'{"loadDict" if load else "saveDict"}.{extension}.{name}')
+    def setup(scale):
+        df = dictFuncs()
+        config = generators.makeConfig(nSites,nChannels)
+        fileName = os.path.join(tmp,f'{name}.{extension}')
+        df.saveDict(config,fileName)
+        n = max(1,int((200 if name == 'small' else 2)*scale))
+        if load:
+            return(lambda: [df.loadDict(fileName,cache=False) for i in range(n)],n)
+        return(lambda: [df.saveDict(config,fileName) for i in range(n)],n)
+
+for extension in ['yml','json']:
+    for name,(nSites,nChannels) in {'small':(2,5),'medium':(50,20),'large':(250,50)}.items():
+        for load in [True,False]:
+            ioCase(name,extension,nSites,nChannels,load)
+
+@case('parseCoordinates.single')
+def coordinatesSingle(scale):
+    latitude,longitude = generators.makeCoordinates(int(60*scale))
+    return(lambda: [parseCoordinates(latitude=lat,longitude=lon) for lat,lon in zip(latitude,longitude)],len(latitude))
+
+@case('parseCoordinates.batch')
+def coordinatesBatch(scale):
+    latitude,longitude = generators.makeCoordinates(int(20000*scale))
+    UID = [f'p{i}' for i in range(len(latitude))]
+    return(lambda: parseCoordinatesBatch(UID=UID,latitude=latitude,longitude=longitude),len(latitude))
+
+@case('parseFrequency')
+def frequency(scale):
+    values = generators.makeFrequencies(int(20000*scale))
+    return(lambda: [parseFrequency(v) for v in values],len(values))
+
+@case('safeFormat')
+def safe(scale):
+    values = generators.makeNames(int(20000*scale))
+    return(lambda: [safeFormat(v) for v in values],len(values))
+
+@case('cleanString')
+def clean(scale):
+    values = generators.makeNames(int(20000*scale))
+    return(lambda: [cleanString(v) for v in values],len(values))
+
+# Bytes allocated per instance (tracemalloc), including nested dataclasses and coerced values
+def memoryPerInstance(n=2000):
+    out = {}
+    for label,cls,coerce in [('site.valid',generators.site,False),('site.coerced',generators.site,True),('compactSite.valid',generators.compactSite,False)]:
+        kwargs = generators.siteKwargs(n,coerce=coerce)
+        tracemalloc.start()
+        start = tracemalloc.get_traced_memory()[0]
+        instances = [cls(**k) for k in kwargs]
+        out[label] = (tracemalloc.get_traced_memory()[0]-start)/n
+        tracemalloc.stop()
+        del instances
+    return(out)
+
+def run(only=None,quick=False,repeat=5,output=None,verbose=True):
+    global tmp
+    scale = .1 if quick else 1
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name,setup in cases.items():
+            if only and not any(name.startswith(o) for o in only):
+                continue
+            fn,number = setup(scale)
+            fn()
+            results[name] = bestTime(fn,number,repeat)
+            if verbose:
+                print(f'{name:<32}{results[name]*1e6:14.2f} us/op')
+    memory = memoryPerInstance(int(2000*scale))
+    if verbose:
+        for name,value in memory.items():
+            print(f'{"memory."+name:<32}{value:14.0f} bytes/instance')
+    out = {
+        'python':platform.python_version(),
+        'platform':platform.platform(),
+        'quick':quick,
+        'seconds':results,
+        'bytesPerInstance':memory,
+        }
+    if output:
+        with open(output,'w') as f:
+            json.dump(out,f,indent=2)
+    return(out)
+
+if __name__ == '__main__':
+    args = cmdParse({'output':None,'quick':False,'repeat':5,'only':[]})
+    run(only=args['only'],quick=args['quick'],repeat=args['repeat'],output=args['output'])
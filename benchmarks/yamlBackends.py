@@ -0,0 +1,75 @@
+# Compare the yaml backends of loadDict/saveDict on small and multi-MB config files
+import os
+import sys
+import tempfile
+from ..dictFuncs import dictFuncs, yamlBackendFactories, getYAMLBackend
+from .generators import makeConfig
+from .suite import bestTime
+
+# Regression check: every backend must be able to save round-trip types (CommentedMap, ScalarFloat, LiteralScalarString)
+# nested inside a plain dict, and reload them unchanged
+nestedSource = '# header\nx: 1.50\ny: yes\nz: |\n  a\n  b\nl: [1, 2]\nb: true\nn:\n'
+
+def checkNested(backends,tmp):
+    df = dictFuncs()
+    source = os.path.join(tmp,'nested.yml')
+    with open(source,'w') as f:
+        f.write(nestedSource)
+    roundtrip = df.loadDict(source,preserveComments=True,cache=False)
+    # A dict which already went through a walk_tree round-trip save
+    df.saveDict(roundtrip,os.path.join(tmp,'walked.yml'))
+    walked = df.loadDict(os.path.join(tmp,'walked.yml'),preserveComments=True,cache=False)
+    expected = df.loadDict(source,cache=False)
+    failed = []
+    for backend in [None]+backends:
+        fileName = os.path.join(tmp,f'nested-{backend}.yml')
+        try:
+            df.saveDict({'wrapped':roundtrip,'walked':walked},fileName,backend=backend)
+            if df.loadDict(fileName,cache=False) != {'wrapped':expected,'walked':expected}:
+                failed.append(f'{backend}: values changed')
+        except Exception as e:
+            failed.append(f'{backend}: {type(e).__name__}: {e}')
+    print(f'nested round-trip types: {"ok" if not failed else failed}')
+    return(failed)
+
+# None must be written with the same bytes as the round-trip backend ('key:' and '- ')
+def checkNulls(backends,tmp):
+    df = dictFuncs()
+    data = {'a':None,'b':{'c':None,'d':[None,1],'e':[[None]]}}
+    outputs = {}
+    for backend in backends:
+        fileName = os.path.join(tmp,f'nulls-{backend}.yml')
+        df.saveDict(data,fileName,backend=backend)
+        with open(fileName) as f:
+            outputs[backend] = f.read()
+    failed = [f'{backend}: {text!r}' for backend,text in outputs.items() if text != outputs['roundtrip']]
+    print(f'null output: {"ok" if not failed else failed}')
+    return(failed)
+
+def run(sizes={'small':(2,5),'large':(250,50)},repeat=3):
+    df = dictFuncs()
+    backends = []
+    for name in yamlBackendFactories:
+        try:
+            getYAMLBackend(name)
+            backends.append(name)
+        except ImportError:
+            print(f'{name}: not available')
+    print(f'fast -> {getYAMLBackend("fast").name}')
+    with tempfile.TemporaryDirectory() as tmp:
+        failed = checkNested(backends,tmp)+checkNulls(backends,tmp)
+        for label,(nSites,nChannels) in sizes.items():
+            config = makeConfig(nSites,nChannels)
+            fileName = os.path.join(tmp,f'{label}.yml')
+            df.saveDict(config,fileName,backend='roundtrip')
+            size = os.path.getsize(fileName)/1e6
+            # Multi-MB files are only timed once
+            n,r = (1,1) if size > 1 else (50,repeat)
+            for backend in backends:
+                load = bestTime(lambda: [df.loadDict(fileName,backend=backend) for i in range(n)],n,r)
+                save = bestTime(lambda: [df.saveDict(makeConfig(nSites,nChannels),fileName,backend=backend) for i in range(n)],n,r)
+                print(f'{label:<6}{size:8.3f} MB  {backend:<12} load {load*1e3:10.2f} ms  save {save*1e3:10.2f} ms')
+    return(failed)
+
+if __name__ == '__main__':
+    sys.exit(1 if run() else 0)
@@ -0,0 +1,337 @@
+# Columnar storage for many records of one baseDataClass (or compactDataClass) subclass, see dataClassMethods.Table
+# * One NumPy column per field, typed from __dataclass_fields__:
+#   float -> float64 (None as nan), int/bool -> int64/bool (object if there are None's), datetime -> datetime64[us] (object if timezone aware),
+#   spatialObject -> (n,2) float64 of lat/lon, anything else (str, list, nested dataclasses) -> object
+# * Values are coerced column-wise following typeEnforcer.coerceType, options are validated over whole columns
+# * Control fields (verbose, typeEnforce, ..., configFile) aren't stored, rows take the class defaults
+# * table[i] returns a row view which reads and writes through to the columns, table[mask or slice] returns a new table
+import inspect
+import numpy as np
+import dataclasses
+from datetime import datetime
+from .log import log
+from .dictFuncs import fieldPlan
+from .datetimeParser import coerceDatetimes
+
+controlFields = ['verbose','typeEnforce','typeCoercion','optionEnforce','debug','configFile']
+
+class table:
+
+    def __init__(self,cls,records=None,columns=None,validate=True):
+        from .baseClass import spatialObject
+        self.cls = cls
+        self.spatialObject = spatialObject
+        self.fields = {name:f for name,f in cls.__dataclass_fields__.items() if f.init and name not in controlFields}
+        metadata = cls.classMetadata()
+        if columns is None:
+            columns = {}
+            records = list(records) if records is not None else []
+            instances = all(isinstance(r,cls) for r in records)
+            for name in self.fields:
+                if instances:
+                    columns[name] = [getattr(r,name) for r in records]
+                else:
+                    default = self.defaultValue(name)
+                    columns[name] = [r[name] if name in r else default() for r in records]
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) > 1:
+            log(f'Columns for {cls.__name__} have different lengths: {sorted(lengths)}',kill=True)
+        length = lengths.pop() if lengths else 0
+        unknown = set(columns)-set(self.fields)
+        if unknown:
+            log(f'Invalid columns for {cls.__name__}: {sorted(unknown)}',kill=True)
+        # Datetimes are localized with the timezone field (as in baseFunctions.parseDatetime)
+        if 'timezone' in columns:
+            self.timezones = list(columns['timezone'])
+        elif 'timezone' in self.fields and self.fields['timezone'].default is not dataclasses.MISSING:
+            self.timezones = self.fields['timezone'].default
+        else:
+            self.timezones = None
+        self.columns = {}
+        for name,f in self.fields.items():
+            if name in columns:
+                values = columns[name]
+            else:
+                default = self.defaultValue(name)
+                values = [default() for i in range(length)]
+            self.columns[name] = self.coerceColumn(name,f.type,values)
+        self.options = {name:options for name,options in metadata.options.items() if name in self.columns}
+        # Per row transientState (dirty tracking, auxargs, ...), keyed on the row index
+        self.rowStates = {}
+        if validate:
+            self.checkOptions()
+
+    def defaultValue(self,name):
+        f = self.fields[name]
+        if f.default is not dataclasses.MISSING:
+            return(lambda: f.default)
+        elif f.default_factory is not dataclasses.MISSING:
+            return(f.default_factory)
+        log(f'Missing required field for {self.cls.__name__}: {name}',kill=True)
+
+    # timezones: one per value or a single timezone, defaults to the table's
+    def coerceColumn(self,name,dtype,values,timezones=None):
+        if isinstance(values,np.ndarray) and dtype in [float,int,bool] and values.dtype.kind in 'fiub':
+            # nan/inf can't be cast to int/bool, nan's are treated as missing by the per value coercion below
+            if dtype is float or values.dtype.kind != 'f' or np.isfinite(values).all():
+                return(values.astype({float:np.float64,int:np.int64,bool:bool}[dtype],copy=False))
+            values = [None if v != v else v for v in values.tolist()]
+        values = list(values)
+        missing = [v is None for v in values]
+        try:
+            if dtype is float:
+                return(np.asarray(values,dtype=np.float64))
+            elif dtype in [int,bool]:
+                if any(missing):
+                    return(np.array([None if m else dtype(v) for v,m in zip(values,missing)],dtype=object))
+                if dtype is bool:
+                    return(np.array([bool(v) for v in values],dtype=bool))
+                return(np.array([int(v) for v in values],dtype=np.int64))
+            elif dtype is str:
+                return(np.array([None if m else str(v) for v,m in zip(values,missing)],dtype=object))
+            elif dtype is datetime:
+                parsed = coerceDatetimes(values,self.timezones if timezones is None else timezones)
+                failed = [v for v,p,m in zip(values,parsed,missing) if p is None and not m]
+                if failed:
+                    raise ValueError(f'could not parse {failed[:5]}')
+                if any(p is not None and p.tzinfo is not None for p in parsed):
+                    return(np.array(parsed,dtype=object))
+                return(np.array([np.datetime64('NaT') if p is None else np.datetime64(p,'us') for p in parsed],dtype='datetime64[us]'))
+            elif dtype is self.spatialObject:
+                out = np.full((len(values),2),np.nan)
+                for i,v in enumerate(values):
+                    if v is not None:
+                        out[i] = v if isinstance(v,(list,tuple,np.ndarray)) and all(type(c) is float for c in v) else self.spatialObject(v).lat_lon
+                return(out)
+        except (ValueError,TypeError,OverflowError) as e:
+            log(f'Type check failed in {self.cls.__name__}: {name} of type {dtype}, {e}',kill=True)
+        # Other types follow coerceType with coerceMethod='full'
+        check = self.cls.typeChecker(dtype)
+        default = self.fields[name].default_factory if self.fields[name].default is dataclasses.MISSING else self.fields[name].default
+        out = np.empty(len(values),dtype=object)
+        for i,v in enumerate(values):
+            if not check(v):
+                if dtype is list:
+                    v = [v]
+                elif dataclasses.is_dataclass(default) and isinstance(v,dict):
+                    v = default(**v)
+                else:
+                    log(f'Type check failed in {self.cls.__name__}: {name} of type {dtype}',kill=True)
+            out[i] = v
+        return(out)
+
+    def missing(self,name):
+        column = self.columns[name]
+        if column.dtype.kind == 'f':
+            return(np.isnan(column) if column.ndim == 1 else np.isnan(column).all(axis=1))
+        elif column.dtype.kind == 'M':
+            return(np.isnat(column))
+        elif column.dtype == object:
+            return(np.array([v is None for v in column],dtype=bool))
+        return(np.zeros(len(column),dtype=bool))
+
+    # Vectorized version of checkOptions, returns {name: indices of invalid rows} or exits if raiseError
+    def checkOptions(self,raiseError=True):
+        invalid = {}
+        for name,options in self.options.items():
+            bad = ~(self.missing(name) | np.isin(self.columns[name],list(options)))
+            if bad.any():
+                invalid[name] = np.flatnonzero(bad)
+        if invalid and raiseError:
+            details = '\n'.join(f'{name}: {sorted(set(self.columns[name][rows].tolist()),key=str)} (rows {rows[:10].tolist()}) is invalid, must be one of {self.options[name]}' for name,rows in invalid.items())
+            log(f'Update parameters to meet required options:\n{details}',kill=True)
+        return(invalid)
+
+    def __len__(self):
+        return(len(next(iter(self.columns.values()))) if self.columns else 0)
+
+    # Integer index -> row view, slice/mask/index array -> new table (slices share memory with this table)
+    def __getitem__(self,key):
+        if isinstance(key,(int,np.integer)):
+            n = len(self)
+            if key < 0:
+                key += n
+            if not 0 <= key < n:
+                raise IndexError(f'row {key} out of range for table of {n} rows')
+            return(rowView(self,int(key)))
+        if isinstance(key,str):
+            return(self.columns[key])
+        out = table.__new__(table)
+        out.__dict__.update(self.__dict__)
+        out.columns = {name:column[key] for name,column in self.columns.items()}
+        out.rowStates = {}
+        if isinstance(self.timezones,list):
+            out.timezones = out.pyColumn('timezone')
+        return(out)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield rowView(self,i)
+
+    def __repr__(self):
+        return(f'table({self.cls.__name__}, {len(self)} rows, columns={list(self.columns)})')
+
+    # Python value of one cell, missing values are None
+    def value(self,name,index):
+        v = self.columns[name][index]
+        if isinstance(v,np.ndarray):
+            return(None if np.isnan(v).all() else v.tolist())
+        if isinstance(v,np.generic):
+            v = v.item()
+        if isinstance(v,float) and v != v:
+            return(None)
+        return(v)
+
+    # Whole column as a list of python values, missing values are None
+    def pyColumn(self,name):
+        column = self.columns[name]
+        values = column.tolist()
+        if column.dtype.kind in 'fM':
+            missing = self.missing(name)
+            if missing.any():
+                values = [None if m else v for v,m in zip(values,missing)]
+        return(values)
+
+    # Records in to_dict order (fields with repr=False are dropped by default)
+    def to_records(self,repr=True,keepNull=True):
+        keys = [k for k in fieldPlan(self.cls,repr,True,keepNull,1,1) if k in self.columns]
+        columns = [self.pyColumn(k) for k in keys]
+        records = [dict(zip(keys,row)) for row in zip(*columns)]
+        if not keepNull:
+            records = [{k:v for k,v in r.items() if v is not None} for r in records]
+        return(records)
+
+    def to_dict(self,repr=True,keepNull=True):
+        from .dictFuncs import dictFuncs
+        return([dictFuncs().serialize(r,repr=repr,keepNull=keepNull) for r in self.to_records(repr=repr,keepNull=keepNull)])
+
+    # Materialize (validated) instances of the dataclass
+    def to_instances(self):
+        return(self.cls.from_records(self.to_records(repr=False)))
+
+    # spatialObject columns are split into <name>_lat and <name>_lon
+    # int/bool columns with None's become nullable Int64/boolean, timezone aware datetimes become datetime64[us, tz] (UTC if the timezones differ)
+    def to_dataframe(self):
+        import pandas as pd
+        data = {}
+        for name,column in self.columns.items():
+            dtype = self.fields[name].type
+            if column.ndim == 2:
+                data[f'{name}_lat'],data[f'{name}_lon'] = column[:,0],column[:,1]
+            elif column.dtype == object and dtype in [int,bool]:
+                data[name] = pd.array(column.tolist(),dtype={int:'Int64',bool:'boolean'}[dtype])
+            elif column.dtype == object and dtype is datetime:
+                values = pd.Series(pd.to_datetime(column.tolist(),utc=True))
+                timezones = {str(v.tzinfo) for v in column if v is not None}
+                if len(timezones) == 1:
+                    values = values.dt.tz_convert(next(v.tzinfo for v in column if v is not None))
+                data[name] = values
+            else:
+                data[name] = column
+        return(pd.DataFrame(data))
+
+    def to_parquet(self,fileName,**kwargs):
+        self.exportFile('to_parquet',fileName,**kwargs)
+
+    def to_feather(self,fileName,**kwargs):
+        self.exportFile('to_feather',fileName,**kwargs)
+
+    def exportFile(self,method,fileName,**kwargs):
+        df = self.to_dataframe()
+        # Nested objects can't be written to columnar formats
+        nested = [name for name in df.columns if df[name].dtype == object and any(v is not None and not isinstance(v,str) for v in df[name])]
+        if nested:
+            log(f'Columns {nested} hold nested objects, drop them or write to yaml/json instead',kill=True)
+        try:
+            getattr(df,method)(fileName,**kwargs)
+        except ImportError as e:
+            log(f'{method} requires pyarrow: {e}',kill=True)
+
+    # Points from a spatialObject field (the first one by default), in geographic coordinates
+    def to_geodataframe(self,field=None,crs='EPSG:4326'):
+        import geopandas as gpd
+        spatial = [name for name,f in self.fields.items() if f.type is self.spatialObject]
+        if field is None:
+            if not spatial:
+                log(f'{self.cls.__name__} has no spatialObject field',kill=True)
+            field = spatial[0]
+        df = self.to_dataframe().drop(columns=[f'{name}_{c}' for name in spatial for c in ['lat','lon']])
+        lat_lon = self.columns[field]
+        return(gpd.GeoDataFrame(df,geometry=gpd.points_from_xy(lat_lon[:,1],lat_lon[:,0]),crs=crs))
+
+
+# A row of a table, field reads and writes go to the table's columns (no copy)
+# Other attributes (methods, class level policy) come from the dataclass, transientState is kept per row on the table
+# Methods which need a real instance of the dataclass are refused, call them on row.to_instance()
+rowUnsupported = {'saveConfigFileIncremental'}
+
+class rowView:
+    __slots__ = ('table','index')
+
+    def __init__(self,table,index):
+        object.__setattr__(self,'table',table)
+        object.__setattr__(self,'index',index)
+
+    def __getattr__(self,name):
+        t = object.__getattribute__(self,'table')
+        if name in t.columns:
+            return(t.value(name,object.__getattribute__(self,'index')))
+        if name in t.cls.__dataclass_fields__:
+            return(t.cls.__dataclass_fields__[name].default)
+        state = t.rowStates.get(object.__getattribute__(self,'index'))
+        if state and name in state:
+            return(state[name])
+        if name in rowUnsupported:
+            raise AttributeError(f'{name} is not supported on {t.cls.__name__} table rows, use row.to_instance().{name}')
+        # classmethods and staticmethods are returned bound to the class, only plain functions are bound to the row
+        static = inspect.getattr_static(t.cls,name)
+        attr = getattr(t.cls,name)
+        if inspect.isfunction(static):
+            return(static.__get__(self))
+        return(attr)
+
+    def __setattr__(self,name,value):
+        t = self.table
+        if name not in t.columns:
+            raise AttributeError(f'{name} is not a column of {t.cls.__name__}')
+        # Datetimes are localized with this row's timezone
+        timezone = t.value('timezone',self.index) if 'timezone' in t.columns else t.timezones
+        coerced = t.coerceColumn(name,t.fields[name].type,[value],timezones=timezone)[0]
+        try:
+            t.columns[name][self.index] = coerced
+        except (TypeError,ValueError):
+            # eg. None in an int column, the column is converted to object
+            t.columns[name] = t.columns[name].astype(object)
+            t.columns[name][self.index] = coerced
+        if name == 'timezone' and isinstance(t.timezones,list):
+            t.timezones[self.index] = t.value(name,self.index)
+        if name in t.options and not (value is None or value in t.options[name]):
+            log(f'Update parameters to meet required options:\n{name}: {value} is invalid, must be one of {t.options[name]}',kill=True)
+
+    def transientState(self):
+        return(self.table.rowStates.setdefault(self.index,{}))
+
+    def to_dict(self,repr=True,keepNull=True,**kwargs):
+        from .dictFuncs import dictFuncs
+        keys = [k for k in fieldPlan(self.table.cls,repr,True,keepNull,1,1) if k in self.table.columns]
+        out = {k:getattr(self,k) for k in keys}
+        if not keepNull:
+            out = {k:v for k,v in out.items() if v is not None}
+        return(dictFuncs().serialize(out,repr=repr,keepNull=keepNull))
+
+    def to_instance(self):
+        return(self.table.cls.from_dict({k:getattr(self,k) for k in self.table.columns}))
+
+    def to_bytes(self):
+        return(self.to_instance().to_bytes())
+
+    def __eq__(self,other):
+        if isinstance(other,rowView):
+            other = other.to_instance()
+        if isinstance(other,self.table.cls):
+            return(all(getattr(self,k) == getattr(other,k) for k in self.table.columns))
+        return(NotImplemented)
+
+    def __repr__(self):
+        values = ', '.join(f'{k}={getattr(self,k)!r}' for k,f in self.table.fields.items() if f.repr)
+        return(f'{self.table.cls.__name__}({values})')
@@ -0,0 +1,87 @@
+# Coerce strings to datetimes with a strict fast path, falling back to dateparser only when needed
+# 1) datetime.fromisoformat (ISO-8601)
+# 2) strptime with a short list of known (year first) formats
+# 3) dateparser, with DATE_ORDER=YMD (slow, so results are cached)
+# Timezone handling matches dateparser's settings used by baseFunctions.parseDatetime:
+# * timezone=None - naive datetimes, offsets in the input are dropped (wall time is kept)
+# * timezone='Area/City' - naive inputs are localized, aware inputs are converted
+from datetime import datetime, date
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+knownFormats = [
+    '%Y/%m/%d',
+    '%Y/%m/%d %H:%M',
+    '%Y/%m/%d %H:%M:%S',
+    '%Y%m%d%H%M',
+    '%Y%m%d%H%M%S',
+    '%Y-%m-%d %H:%M:%S.%f',
+    ]
+
+@lru_cache(maxsize=None)
+def getZoneInfo(timezone):
+    return(ZoneInfo(timezone))
+
+def dateparserSettings(timezone=None):
+    if timezone is None:
+        return({'DATE_ORDER':'YMD','RETURN_AS_TIMEZONE_AWARE':False})
+    return({'DATE_ORDER':'YMD','RETURN_AS_TIMEZONE_AWARE':True,'TIMEZONE':str(getZoneInfo(timezone))})
+
+def fastParseDatetime(value):
+    try:
+        return(datetime.fromisoformat(value.strip()))
+    except ValueError:
+        pass
+    for fmt in knownFormats:
+        try:
+            return(datetime.strptime(value.strip(),fmt))
+        except ValueError:
+            continue
+    return(None)
+
+def applyTimezone(value,timezone=None):
+    if timezone is None:
+        return(value.replace(tzinfo=None))
+    if value.tzinfo is None:
+        return(value.replace(tzinfo=getZoneInfo(timezone)))
+    return(value.astimezone(getZoneInfo(timezone)))
+
+# Returns (datetime,usedFallback), usedFallback is True if dateparser was needed
+@lru_cache(maxsize=65536)
+def coerceDatetimeCached(value,timezone=None):
+    parsed = fastParseDatetime(value)
+    if parsed is not None:
+        return(applyTimezone(parsed,timezone),False)
+    import dateparser
+    return(dateparser.parse(value,settings=dateparserSettings(timezone)),True)
+
+def coerceDatetime(value,timezone=None):
+    if isinstance(value,datetime):
+        return(value,False)
+    if isinstance(value,date):
+        return(datetime.fromisoformat(value.isoformat()),False)
+    if isinstance(value,str):
+        return(coerceDatetimeCached(value,timezone))
+    import dateparser
+    return(dateparser.parse(value,settings=dateparserSettings(timezone)),True)
+
+# Batch version for whole columns, each unique (value,timezone) pair is only parsed once
+# timezone can be a single value or a sequence aligned with values
+# Returns a list of datetimes (None where parsing failed)
+def coerceDatetimes(values,timezone=None):
+    values = list(values)
+    if isinstance(timezone,str) or timezone is None:
+        timezones = [timezone]*len(values)
+    else:
+        timezones = list(timezone)
+    parsed = {}
+    out = []
+    for value,tz in zip(values,timezones):
+        if value is None or value != value: # None or NaN
+            out.append(None)
+            continue
+        key = (value,tz)
+        if key not in parsed:
+            parsed[key] = coerceDatetime(value,tz)[0]
+        out.append(parsed[key])
+    return(out)
@@ -5,16 +5,412 @@ import sys
 import json
 from typing import Iterable
 from .log import log
+from .instrument import timed
+import io
+import uuid
 import copy
+import pickle
+import stat
+import atexit
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 ymlStartMarker = '\n---\n'
 
-from ruamel.yaml import YAML
-
 from dataclasses import is_dataclass
 
-from ruamel.yaml.scalarstring import walk_tree
+# ruamel.yaml is imported and instantiated on first use to keep import time low
+_yaml = None
+
+def getYAML():
+    global _yaml
+    if _yaml is None:
+        from ruamel.yaml import YAML
+        _yaml = YAML()
+    return(_yaml)
+
+# Preserve access to the module level yaml instance
+def __getattr__(name):
+    if name == 'yaml':
+        return(getYAML())
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Pluggable yaml backends for loadDict/saveDict, each has a load(stream) and dump(obj,stream) method
+# * roundtrip - ruamel round-trip, required to preserve comments (CommentedMap)
+# * ruamel-c - ruamel safe loader/dumper backed by libyaml (requires ruamel.yaml.clib)
+# * pyyaml-c - PyYAML CSafeLoader/CSafeDumper (requires PyYAML built with libyaml), note PyYAML follows yaml 1.1 (e.g. yes/no are booleans)
+# * ruamel-safe - pure python ruamel safe loader/dumper, always available
+# * fast - ruamel-c if available, otherwise ruamel-safe (pyyaml-c is opt-in by name, so parsed values never depend on the installed wheels)
+class roundtripBackend:
+    name = 'roundtrip'
+    preservesComments = True
+
+    def load(self,stream):
+        return(getYAML().load(stream))
+
+    def dump(self,obj,stream,stringLiterals=True):
+        if stringLiterals:
+            from ruamel.yaml.scalarstring import walk_tree
+            walk_tree(obj)
+        getYAML().dump(obj,stream)
+
+# Multi-line strings are written as literal blocks and None as an empty value, matching the round-trip output
+def representStr(representer,data):
+    if '\n' in data:
+        return(representer.represent_scalar('tag:yaml.org,2002:str',data,style='|'))
+    return(representer.represent_scalar('tag:yaml.org,2002:str',data))
+
+def representNone(representer,data):
+    return(representer.represent_scalar('tag:yaml.org,2002:null',''))
+
+# The libyaml emitters space empty values differently ('key: ' or '-') from the pure python emitter used by round-trip ('key:' and '- ')
+# so the C backends write None as a placeholder which is replaced afterwards, giving the same bytes
+nullPlaceholder = 'null'+uuid.uuid4().hex
+
+def representNullPlaceholder(representer,data):
+    return(representer.represent_scalar('tag:yaml.org,2002:str',nullPlaceholder))
+
+def dumpNulls(dump,obj,stream):
+    buffer = io.StringIO()
+    dump(obj,buffer)
+    text = buffer.getvalue()
+    if nullPlaceholder in text:
+        text = text.replace(': '+nullPlaceholder,':').replace(nullPlaceholder,'')
+    stream.write(text)
+
+# Subclasses of the builtin types (e.g. CommentedMap, ScalarFloat, LiteralScalarString from a round-trip load) are written as the builtin type
+builtinTypes = (dict,list,str,float,int)
+def representBuiltin(representer,data):
+    from ruamel.yaml.scalarbool import ScalarBoolean
+    if isinstance(data,ScalarBoolean):
+        return(representer.represent_data(bool(data)))
+    for base in builtinTypes:
+        if isinstance(data,base):
+            return(representer.represent_data(base(data)))
+
+class ruamelSafeBackend:
+    preservesComments = False
+
+    def __init__(self,pure=False):
+        from ruamel.yaml import YAML
+        from ruamel.yaml.representer import SafeRepresenter
+        if not pure:
+            # Raises ImportError if ruamel.yaml.clib is missing
+            from ruamel.yaml.cyaml import CParser
+        self.name = 'ruamel-safe' if pure else 'ruamel-c'
+        representer = type('representer',(SafeRepresenter,),{})
+        representer.add_representer(type(None),representNone if pure else representNullPlaceholder)
+        for base in builtinTypes:
+            representer.add_multi_representer(base,representBuiltin)
+        literalRepresenter = type('literalRepresenter',(representer,),{})
+        literalRepresenter.add_representer(str,representStr)
+        # The representer is bound on first use, so plain and literal string output need separate instances
+        self.yaml,self.literalYAML = YAML(typ='safe',pure=pure),YAML(typ='safe',pure=pure)
+        for yaml,rep in [(self.yaml,representer),(self.literalYAML,literalRepresenter)]:
+            yaml.Representer = rep
+            yaml.default_flow_style = False
+            yaml.allow_unicode = True
+            yaml.sort_base_mapping_type_on_output = False
+
+    def load(self,stream):
+        return(self.yaml.load(stream))
+
+    def dump(self,obj,stream,stringLiterals=True):
+        yaml = self.literalYAML if stringLiterals else self.yaml
+        if self.name == 'ruamel-c':
+            dumpNulls(yaml.dump,obj,stream)
+        else:
+            yaml.dump(obj,stream)
+
+class pyyamlCBackend:
+    name = 'pyyaml-c'
+    preservesComments = False
+
+    def __init__(self):
+        import yaml
+        if not yaml.__with_libyaml__:
+            raise ImportError('PyYAML was built without libyaml')
+        self.yaml = yaml
+        self.dumper = type('dumper',(yaml.CSafeDumper,),{})
+        self.dumper.add_representer(type(None),representNullPlaceholder)
+        for base in builtinTypes:
+            self.dumper.add_multi_representer(base,representBuiltin)
+        self.literalDumper = type('literalDumper',(self.dumper,),{})
+        self.literalDumper.add_representer(str,representStr)
+
+    def load(self,stream):
+        return(self.yaml.load(stream,Loader=self.yaml.CSafeLoader))
+
+    def dump(self,obj,stream,stringLiterals=True):
+        dumpNulls(lambda obj,stream: self.yaml.dump(obj,stream,Dumper=self.literalDumper if stringLiterals else self.dumper,
+                                                    sort_keys=False,default_flow_style=False,allow_unicode=True),obj,stream)
+
+yamlBackendFactories = {
+    'roundtrip':roundtripBackend,
+    'ruamel-c':lambda: ruamelSafeBackend(pure=False),
+    'pyyaml-c':pyyamlCBackend,
+    'ruamel-safe':lambda: ruamelSafeBackend(pure=True),
+}
+fastBackendOrder = ['ruamel-c','ruamel-safe']
+yamlBackends = {}
+
+def getYAMLBackend(name='fast'):
+    if name == 'fast':
+        for candidate in fastBackendOrder:
+            try:
+                return(getYAMLBackend(candidate))
+            except ImportError:
+                continue
+    if name not in yamlBackends:
+        if name not in yamlBackendFactories:
+            log(f'Unknown yaml backend: {name}, must be one of {["fast"]+list(yamlBackendFactories)}',kill=True)
+        yamlBackends[name] = yamlBackendFactories[name]()
+    return(yamlBackends[name])
+
+# Opt-in cache of parsed config files, keyed on (absolute path, mtime_ns, size) and the load options
+# * Bounded LRU, callers always receive a deep copy so the cached document can't be modified
+# * Optional on-disk pickle sidecars (in sidecarDir) so cold process starts also skip parsing
+# * Entries and counters are guarded by lock, files are parsed outside it
+# Enable globally with configCache.configure(enabled=True) or per call with loadDict(...,cache=True)
+class configCache:
+    lock = threading.RLock()
+    enabled = False
+    maxsize = 128
+    sidecarDir = None
+    entries = OrderedDict()
+    hits = 0
+    misses = 0
+    sidecarHits = 0
+
+    @classmethod
+    def configure(cls,enabled=None,maxsize=None,sidecarDir=None):
+        if enabled is not None:
+            cls.enabled = enabled
+        if maxsize is not None:
+            with cls.lock:
+                cls.maxsize = maxsize
+                cls.trim()
+        if sidecarDir is not None:
+            cls.sidecarDir = sidecarDir or None
+
+    @classmethod
+    def key(cls,fileName,**kwargs):
+        info = os.stat(fileName)
+        return((fileName,info.st_mtime_ns,info.st_size)+tuple(sorted(kwargs.items())))
+
+    @classmethod
+    def get(cls,fileName,reader,**kwargs):
+        key = cls.key(fileName,**kwargs)
+        with cls.lock:
+            hit = key in cls.entries
+            if hit:
+                value = cls.entries[key]
+                cls.hits += 1
+                cls.entries.move_to_end(key)
+            else:
+                cls.misses += 1
+        if not hit:
+            value = cls.readSidecar(key)
+            if value is None:
+                value = reader(fileName,**kwargs)
+                cls.writeSidecar(key,value)
+            else:
+                with cls.lock:
+                    cls.sidecarHits += 1
+            with cls.lock:
+                # Drop stale entries for the same file and options
+                for k in [k for k in cls.entries if k[0] == fileName and k[3:] == key[3:]]:
+                    del cls.entries[k]
+                cls.entries[key] = value
+                cls.trim()
+        # Copy the value held here, the entry may be evicted or replaced by another thread
+        return(copy.deepcopy(value))
+
+    @classmethod
+    def trim(cls):
+        with cls.lock:
+            while len(cls.entries) > cls.maxsize:
+                cls.entries.popitem(last=False)
+
+    @classmethod
+    def sidecarPath(cls,key):
+        import hashlib
+        digest = hashlib.sha1(repr(key[:1]+key[3:]).encode()).hexdigest()
+        return(os.path.join(cls.sidecarDir,f'{os.path.basename(key[0])}.{digest}.pickle'))
+
+    @classmethod
+    def readSidecar(cls,key):
+        if cls.sidecarDir is None:
+            return(None)
+        sidecar = cls.sidecarPath(key)
+        if not os.path.isfile(sidecar):
+            return(None)
+        try:
+            with open(sidecar,'rb') as file:
+                stored = pickle.load(file)
+        except Exception:
+            return(None)
+        if stored['key'] == key:
+            return(stored['value'])
+        return(None)
+
+    @classmethod
+    def writeSidecar(cls,key,value):
+        if cls.sidecarDir is None:
+            return
+        # Sidecars are optional, the file was already read so write failures (e.g. a read-only folder) are skipped
+        try:
+            os.makedirs(cls.sidecarDir,exist_ok=True)
+            with open(cls.sidecarPath(key),'wb') as file:
+                pickle.dump({'key':key,'value':value},file,protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError:
+            return
+        except (pickle.PicklingError,TypeError,AttributeError):
+            try:
+                os.remove(cls.sidecarPath(key))
+            except OSError:
+                pass
+
+    @classmethod
+    def stats(cls):
+        with cls.lock:
+            return({'size':len(cls.entries),'maxsize':cls.maxsize,'hits':cls.hits,'misses':cls.misses,'sidecarHits':cls.sidecarHits})
+
+    @classmethod
+    def clear(cls,sidecars=False):
+        with cls.lock:
+            cls.entries.clear()
+            cls.hits = 0
+            cls.misses = 0
+            cls.sidecarHits = 0
+        if sidecars and cls.sidecarDir is not None and os.path.isdir(cls.sidecarDir):
+            for f in os.listdir(cls.sidecarDir):
+                if f.endswith('.pickle'):
+                    os.remove(os.path.join(cls.sidecarDir,f))
+
+
+# Folders known to exist, so repeated saves skip the isdir/makedirs check
+knownDirs = set()
+
+# Write str or bytes to fileName
+def writeFile(fileName,data,atomic=True,fsync=False):
+    # Write through symlinks rather than replacing them
+    fileName = os.path.realpath(fileName)
+    folder = os.path.split(fileName)[0]
+    makeFolder(folder)
+    mode = 'wb' if isinstance(data,(bytes,bytearray,memoryview)) else 'w'
+    if not atomic:
+        try:
+            file = open(fileName,mode)
+        except FileNotFoundError:
+            # Folder was removed since it was cached
+            makeFolder(folder,retry=True)
+            file = open(fileName,mode)
+        with file:
+            file.write(data)
+            if fsync:
+                file.flush()
+                os.fsync(file.fileno())
+        return
+    import tempfile
+    try:
+        fd,tmp = tempfile.mkstemp(dir=folder or '.',prefix='.'+os.path.basename(fileName)+'.',suffix='.tmp')
+    except FileNotFoundError:
+        makeFolder(folder,retry=True)
+        fd,tmp = tempfile.mkstemp(dir=folder or '.',prefix='.'+os.path.basename(fileName)+'.',suffix='.tmp')
+    try:
+        # mkstemp creates files as 0600, keep the existing file's permissions or use the default for new files
+        try:
+            permissions = stat.S_IMODE(os.stat(fileName).st_mode)
+        except FileNotFoundError:
+            permissions = 0o666 & ~umask()
+        os.chmod(tmp,permissions)
+        with os.fdopen(fd,mode) as file:
+            file.write(data)
+            if fsync:
+                file.flush()
+                os.fsync(file.fileno())
+        os.replace(tmp,fileName)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+# Create a folder once per process, retry drops it from knownDirs first (it was removed since it was cached)
+def makeFolder(folder,retry=False):
+    if retry:
+        knownDirs.discard(folder)
+    if folder != '' and folder not in knownDirs:
+        os.makedirs(folder,exist_ok=True)
+        knownDirs.add(folder)
+
+# The process umask can only be read by setting it, so it's read once
+@lru_cache(maxsize=1)
+def umask():
+    mask = os.umask(0)
+    os.umask(mask)
+    return(mask)
+
 
-yaml = YAML()
+# Background writer for dictFuncs.saveDictAsync
+# Pending saves are keyed on the absolute path, a newer save of the same path replaces the pending one
+# Errors are logged and stored in errors rather than raised in the caller
+class asyncDictWriter:
+    pending = OrderedDict()
+    condition = threading.Condition()
+    thread = None
+    busy = False
+    errors = {}
+
+    @classmethod
+    def submit(cls,writer,obj,fileName,snapshot=True,**kwargs):
+        if snapshot:
+            obj = copy.deepcopy(obj)
+        key = os.path.abspath(fileName)
+        with cls.condition:
+            cls.pending.pop(key,None)
+            cls.pending[key] = (writer,obj,fileName,kwargs)
+            if cls.thread is None or not cls.thread.is_alive():
+                cls.thread = threading.Thread(target=cls.run,name='asyncDictWriter',daemon=True)
+                cls.thread.start()
+            cls.condition.notify_all()
+
+    @classmethod
+    def run(cls):
+        while True:
+            with cls.condition:
+                while not cls.pending:
+                    cls.condition.wait()
+                key,(writer,obj,fileName,kwargs) = cls.pending.popitem(last=False)
+                cls.busy = True
+            try:
+                writer.saveDict(obj,fileName,**kwargs)
+                cls.errors.pop(key,None)
+            except (Exception,SystemExit) as e:
+                cls.errors[key] = f'{type(e).__name__}: {e}'
+                log(f'Background save failed for {fileName}: {cls.errors[key]}')
+            finally:
+                with cls.condition:
+                    cls.busy = False
+                    cls.condition.notify_all()
+
+    # Block until all pending saves are written, returns False if timeout was reached first
+    @classmethod
+    def flush(cls,timeout=None):
+        with cls.condition:
+            return(cls.condition.wait_for(lambda: not cls.pending and not cls.busy,timeout=timeout))
+
+atexit.register(asyncDictWriter.flush)
+
+
+# Worker for dictFuncs.loadMany, defined at module level so it can be pickled for process pools
+# loadDict exits on errors, so SystemExit is caught along with regular exceptions
+def loadWorker(fileName,kwargs):
+    try:
+        return(dictFuncs().loadDict(fileName,**kwargs),None)
+    except (Exception,SystemExit) as e:
+        return(None,f'{type(e).__name__}: {e}')
 
 
 # Convert a dataclass to a dictionary
@@ -32,7 +428,23 @@ yaml = YAML()
 #   * True - include all values
 #   * False - exclude values if they are None
 
+# Cache of output keys for dictFuncs.serialize, keyed on (class,repr,inheritance,keepNull,majorOrder,minorOrder)
+fieldPlans = {}
+
+def fieldPlan(cls,repr=True,inheritance=True,keepNull=True,majorOrder=1,minorOrder=1):
+    key = (cls,repr,inheritance,keepNull,majorOrder,minorOrder)
+    if key not in fieldPlans:
+        fields = cls.__dataclass_fields__
+        if inheritance:
+            outputKeys = [n for m in cls.__mro__[::majorOrder] if hasattr(m,'__annotations__') for n in list(m.__annotations__)[::minorOrder]]
+        else:
+            outputKeys = list(cls.__annotations__)
+        # Drop duplicates (first occurrence wins) and annotations which aren't fields
+        fieldPlans[key] = tuple(k for k in dict.fromkeys(outputKeys) if k in fields and (fields[k].repr or not repr))
+    return(fieldPlans[key])
+
 class dictFuncs:
+    __slots__ = ()
 
     def sortDict(self,obj,sorted=True):
         
@@ -100,30 +512,69 @@ class dictFuncs:
         return vcopy
 
 
+    # Iterative alternative to dcToDict with the same options, used by baseDataClass.to_dict
+    # * Output keys are resolved once per (class,repr,inheritance,keepNull,majorOrder,minorOrder) and cached in fieldPlans
+    # * Walks the graph with an explicit stack, so deep nesting can't hit the recursion limit
+    # * Objects referenced more than once are serialized separately for each reference (as dcToDict), so yaml output has no aliases
+    # * cycles: 'error' exits with a message, 'reference' returns a cyclic output (only yaml can represent it)
+    def serialize(self,obj,repr=True,inheritance=True,keepNull=True,majorOrder=1,minorOrder=1,sorted=False,cycles='error'):
+        # Output dicts of the objects currently being filled in, only used to detect cycles
+        active = {}
+        stack = []
+        def visit(value):
+            if is_dataclass(value) and not isinstance(value,type):
+                keys = fieldPlan(type(value),repr,inheritance,keepNull,majorOrder,minorOrder)
+                items = ((k,getattr(value,k)) for k in keys if hasattr(value,k))
+                isDataclass = True
+            elif isinstance(value,dict):
+                items = iter(value.items())
+                isDataclass = False
+            else:
+                return(value)
+            key = id(value)
+            if key in active:
+                if cycles != 'reference':
+                    log(f'Cyclic reference to {type(value).__name__} found while serializing {type(obj).__name__}',kill=True)
+                return(active[key])
+            out = {}
+            active[key] = out
+            stack.append((key,out,items,isDataclass))
+            return(out)
+        root = visit(obj)
+        while stack:
+            frame = stack[-1]
+            key,out,items,isDataclass = frame
+            for k,v in items:
+                if isDataclass and not keepNull and v is None:
+                    continue
+                out[k] = visit(v)
+                if stack[-1] is not frame:
+                    # Fill in the child first, then resume this frame
+                    break
+            else:
+                stack.pop()
+                del active[key]
+                if sorted and isDataclass:
+                    # Sort in place so cyclic references see the sorted output
+                    ordered = self.sortDict(out)
+                    out.clear()
+                    out.update(ordered)
+        return(root)
+
     # Load a dictionary a .json or .yml file
     # Preserve the header in a yaml file if desired
-    def loadDict(self,fileName=None,returnEmpty=False,returnHeader=False,verbose=False,traceback=False,preserveComments=False):
+    # backend: name of a yaml backend, by default round-trip if preserveComments, otherwise the fastest available
+    # cache: use configCache, by default follows configCache.enabled
+    @timed
+    def loadDict(self,fileName=None,returnEmpty=False,returnHeader=False,verbose=False,traceback=False,preserveComments=False,backend=None,cache=None):
         fileName = os.path.abspath(fileName)
         if os.path.isfile(fileName):
-            if fileName.endswith('.yml') or fileName.endswith('.yaml'):
-                # check for header in yaml file
-                with open(fileName) as file:
-                    tmp = file.read()
-                    if ymlStartMarker in tmp:
-                        header = tmp.split(ymlStartMarker)[0]
-                    else:
-                        header = None
-                with open(fileName) as file:
-                    out = yaml.load(file)
-                    
-                if not preserveComments:
-                    out = dict(out)
-            elif fileName.endswith('.json'):
-                with open(fileName) as file:
-                    out = json.load(file)
-                    header = None
-            else:
+            if not (fileName.endswith('.yml') or fileName.endswith('.yaml') or fileName.endswith('.json')):
                 log(f'File format not supported for {fileName}',kill=True)
+            if cache or (cache is None and configCache.enabled):
+                out,header = configCache.get(fileName,dictFuncs.readDict,preserveComments=preserveComments,backend=backend)
+            else:
+                out,header = dictFuncs.readDict(fileName,preserveComments=preserveComments,backend=backend)
         elif returnEmpty:
             return({})
 
@@ -134,33 +585,167 @@ class dictFuncs:
         else:
             return(out)
 
+    # Parse a .json or .yml file, returns (out,header)
+    @staticmethod
+    def readDict(fileName,preserveComments=False,backend=None):
+        if fileName.endswith('.yml') or fileName.endswith('.yaml'):
+            # check for header in yaml file, parse from the same read
+            with open(fileName) as file:
+                tmp = file.read()
+            if ymlStartMarker in tmp:
+                header = tmp.split(ymlStartMarker)[0]
+            else:
+                header = None
+            if backend is None:
+                backend = 'roundtrip' if preserveComments else 'fast'
+            out = getYAMLBackend(backend).load(tmp)
+
+            if not preserveComments:
+                out = dict(out)
+        elif fileName.endswith('.json'):
+            with open(fileName) as file:
+                out = json.load(file)
+                header = None
+        return(out,header)
+
+    # Load many files concurrently with a thread or process pool, preserving input order
+    # Errors are collected per file instead of exiting, returns (outputs,errors)
+    # outputs is None for files which failed, errors is a dict of {fileName: message}
+    def loadMany(self,fileNames,workers=None,executor='process',**kwargs):
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+        fileNames = list(fileNames)
+        if executor == 'process':
+            pool = ProcessPoolExecutor(max_workers=workers)
+        elif executor == 'thread':
+            pool = ThreadPoolExecutor(max_workers=workers)
+        else:
+            log(f'Invalid executor: {executor}, must be process or thread',kill=True)
+        with pool:
+            results = list(pool.map(loadWorker,fileNames,[kwargs]*len(fileNames)))
+        outputs = [out for out,error in results]
+        errors = {fileName:error for fileName,(out,error) in zip(fileNames,results) if error is not None}
+        return(outputs,errors)
+
     # Save a dictionary to json or yaml format
     # Preserve yaml header if desired
-    def saveDict(self,obj,fileName,header=None,sort_keys=False,indent=None,anchors=False,stringLiterals=True):
-        if os.path.split(fileName)[0] == '':
-            pass
-        elif not os.path.isdir(os.path.split(fileName)[0]):
-            os.makedirs(os.path.split(fileName)[0])
+    # backend: name of a yaml backend, by default round-trip if obj carries comments (CommentedMap), otherwise the fastest available
+    # atomic: write to a temporary file in the same folder and os.replace it, so a crash never leaves a truncated file
+    # fsync: also flush the file to disk before replacing
+    @timed
+    def saveDict(self,obj,fileName,header=None,sort_keys=False,indent=None,anchors=False,stringLiterals=True,backend=None,atomic=True,fsync=False):
+        # Serialize to an in memory buffer, then write once
+        buffer = io.StringIO()
+        if fileName.endswith('.yml') or fileName.endswith('.yaml'):
+            if backend is None:
+                backend = 'roundtrip' if hasattr(obj,'ca') else 'fast'
+            if header:
+                header = '\n'.join([h if h.startswith('#') else '# '+h for h in header.split('\n')])
+                buffer.write(header+ymlStartMarker)
+            getYAMLBackend(backend).dump(obj,buffer,stringLiterals=stringLiterals)
+            # if anchors:
+            #     yaml.safe_dump(obj,file,sort_keys=sort_keys,default_flow_style=False)
+            # else:
+            #     yaml.safe_dump(obj,file,sort_keys=sort_keys)
+        if fileName.endswith('.json'):
+            json.dump(obj,buffer,indent=indent)
+        writeFile(fileName,buffer.getvalue(),atomic=atomic,fsync=fsync)
 
-        with open(fileName,'w') as file:
-            if fileName.endswith('.yml'):
-                if header:
-                    header = '\n'.join([h if h.startswith('#') else '# '+h for h in header.split('\n')])
-                    file.write(header+ymlStartMarker)
-                if stringLiterals:
-                    walk_tree(obj)
-                if anchors:
-                    yaml.dump(obj,file)
+    # Queue a save on the background writer, repeated saves of the same path are coalesced (only the latest is written)
+    # obj is deep copied unless snapshot=False, so the caller can keep modifying it
+    def saveDictAsync(self,obj,fileName,snapshot=True,**kwargs):
+        asyncDictWriter.submit(self if self is not None else dictFuncs(),obj,fileName,snapshot=snapshot,**kwargs)
+
+    def flushAsyncSaves(self,timeout=None):
+        return(asyncDictWriter.flush(timeout))
+
+    # Stream documents from a multi-document yaml file (--- separated) or a JSON Lines file one at a time
+    # The header (comment lines before the first ---) is read from the same pass
+    # If returnHeader, yields (header,document) tuples
+    def iterDicts(self,fileName,returnHeader=False,preserveComments=False,backend=None):
+        fileName = os.path.abspath(fileName)
+        if not os.path.isfile(fileName):
+            log(f'Does not exist:\n {fileName}',kill=True)
+        if fileName.endswith('.yml') or fileName.endswith('.yaml'):
+            if backend is None:
+                backend = 'roundtrip' if preserveComments else 'fast'
+            documents = dictFuncs.iterYAML(fileName,preserveComments,backend)
+        elif fileName.endswith('.jsonl') or fileName.endswith('.ndjson'):
+            documents = dictFuncs.iterJSONLines(fileName)
+        else:
+            log(f'File format not supported for {fileName}',kill=True)
+        for header,doc in documents:
+            if returnHeader:
+                yield(header,doc)
+            else:
+                yield(doc)
+
+    @staticmethod
+    def iterYAML(fileName,preserveComments=False,backend='fast'):
+        yaml = getYAMLBackend(backend)
+        header = None
+        chunk = []
+        first = True
+        with open(fileName) as file:
+            for line in file:
+                if line.startswith('---') and line[3:4] in ('',' ','\t','\n','\r'):
+                    if first and all(l.lstrip().startswith('#') or l.strip() == '' for l in chunk):
+                        if any(l.strip() for l in chunk):
+                            header = ''.join(chunk).rstrip('\n')
+                        chunk = []
+                    first = False
+                    doc = dictFuncs.parseYAMLChunk(yaml,chunk,preserveComments)
+                    if doc is not None:
+                        yield(header,doc)
+                    chunk = [line[3:]] if line[3:].strip() else []
+                elif line.rstrip() == '...':
+                    doc = dictFuncs.parseYAMLChunk(yaml,chunk,preserveComments)
+                    if doc is not None:
+                        yield(header,doc)
+                    chunk = []
                 else:
-                    yaml.dump(obj,file)
-                # if anchors:
-                #     yaml.safe_dump(obj,file,sort_keys=sort_keys,default_flow_style=False)
-                # else:
-                #     yaml.safe_dump(obj,file,sort_keys=sort_keys)
-            if fileName.endswith('.json'):
-                json.dump(obj,file,indent=indent)
+                    chunk.append(line)
+            doc = dictFuncs.parseYAMLChunk(yaml,chunk,preserveComments)
+            if doc is not None:
+                yield(header,doc)
+
+    @staticmethod
+    def parseYAMLChunk(yaml,chunk,preserveComments=False):
+        if not any(l.strip() and not l.lstrip().startswith('#') for l in chunk):
+            return(None)
+        doc = yaml.load(''.join(chunk))
+        if not preserveComments and isinstance(doc,dict):
+            doc = dict(doc)
+        return(doc)
 
+    @staticmethod
+    def iterJSONLines(fileName):
+        with open(fileName) as file:
+            for line in file:
+                if line.strip():
+                    yield(None,json.loads(line))
 
+    # Write an iterable of dictionaries one document at a time to a multi-document yaml or JSON Lines file
+    def writeDicts(self,fileName,iterable,header=None,indent=None,stringLiterals=True,backend='fast'):
+        if os.path.split(fileName)[0] != '' and not os.path.isdir(os.path.split(fileName)[0]):
+            os.makedirs(os.path.split(fileName)[0])
+        count = 0
+        with open(fileName,'w') as file:
+            if fileName.endswith('.yml') or fileName.endswith('.yaml'):
+                yaml = getYAMLBackend(backend)
+                if header:
+                    header = '\n'.join([h if h.startswith('#') else '# '+h for h in header.split('\n')])
+                    file.write(header+'\n')
+                for obj in iterable:
+                    file.write('---\n')
+                    yaml.dump(obj,file,stringLiterals=stringLiterals)
+                    count += 1
+            elif fileName.endswith('.jsonl') or fileName.endswith('.ndjson'):
+                for obj in iterable:
+                    file.write(json.dumps(obj,indent=indent)+'\n')
+                    count += 1
+            else:
+                log(f'File format not supported for {fileName}',kill=True)
+        return(count)
 
     # Stashing here in case needed for later.  
     def unpackDict(self,Tree,format=os.path.sep,limit=None):
@@ -200,6 +785,8 @@ class dictFuncs:
         elif type(itemList) is not dict:
             itemList = {itemList:fill}
         for key,value in itemList.items():
+            if type(value) is dict:
+                value = copy.deepcopy(value)
             if base is None:
                 b = key.split(format)
             else:
@@ -226,35 +813,46 @@ class dictFuncs:
                         subTree = {format.join(b[end-1:]):value}
                     else:
                         subTree = {b[end-1-i]:subTree}
-            Tree = self.updateDict(Tree,subTree,overwrite='append',verbose=verbose)
+            # Tree is owned here, so it can be built in place in a single pass
+            Tree = self.updateDict(Tree,subTree,overwrite='append',verbose=verbose,mode='inplace')
         return(Tree)
 
 # more comprehensive way to update items in a nested dict compared to the base|new operator
+# mode controls how base is copied:
+#   * 'copy' - deep copy base once, the result shares nothing with base
+#   * 'shared' - copy-on-write, only dicts along modified paths are copied, untouched subtrees are shared with base
+#   * 'inplace' - modify base directly, for callers which own base
 
-    def updateDict(self,base,new,overwrite=False,verbose=False):
-        base = copy.deepcopy(base)
+    def updateDict(self,base,new,overwrite=False,verbose=False,mode='copy'):
+        if mode == 'copy':
+            base = copy.deepcopy(base)
+            mode = 'inplace'
+        elif mode == 'shared':
+            base = copy.copy(base)
+        elif mode != 'inplace':
+            log(f'Invalid updateDict mode: {mode}',kill=True)
         if base == new: return(base)
         for key,value in new.items():
             if type(base) is dict and key not in base.keys():
-                log(['setting: ',key,' = ',base,'\n to: ',key,' = ',value],verbose=verbose)
+                if verbose: log(['setting: ',key,' = ',base,'\n to: ',key,' = ',value])
                 base[key]=value
             elif type(value) is dict and type(base[key]) is dict:
-                base[key] = self.updateDict(base[key],value,overwrite,verbose)
+                base[key] = self.updateDict(base[key],value,overwrite,verbose,mode)
             elif overwrite == True and base[key]!= value:
-                log(['setting: ',key,' = ',base[key],'\n to: ',key,' = ',value],verbose=verbose)
+                if verbose: log(['setting: ',key,' = ',base[key],'\n to: ',key,' = ',value])
                 base[key] = value
             elif overwrite == 'append' and type(base[key]) is list:
-                log(['adding: ',value,'\n to: ',key,' = ',base[key]],verbose=verbose)
+                if verbose: log(['adding: ',value,'\n to: ',key,' = ',base[key]])
                 if type(base[key][0]) is not list and type(base[key][0]) is not dict and type(value) is list:
                     base[key] = [base[key]]
                 base[key]=base[key] + value
             elif overwrite == 'append' and type(base[key]) is not list and base[key] != value:
                 base[key] = [base[key]]
-                log(['adding: ',value,'\n to: ',key,' = ',base[key]],verbose=verbose)
+                if verbose: log(['adding: ',value,'\n to: ',key,' = ',base[key]])
                 base[key].append(value)
             elif base[key] is None and value is not None:
-                log(['setting: ',key,' = ',base[key],'\n to: ',key,' = ',value],verbose=verbose)
+                if verbose: log(['setting: ',key,' = ',base[key],'\n to: ',key,' = ',value])
                 base[key] = value
             elif base[key] != value:
-                log([f'overwrite = {overwrite} will not update matching keys: ',base[key],value],verbose=verbose)
-        return(base) 
\ No newline at end of file
+                if verbose: log([f'overwrite = {overwrite} will not update matching keys: ',base[key],value])
+        return(base)
\ No newline at end of file
@@ -0,0 +1,166 @@
+# Opt-in timers and counters for the baseDataClass lifecycle (__post_init__, checkType, coerceType, checkOptions, loadDict, saveDict, parseCoordinates)
+# Enable with the HELPERFUNCTIONS_INSTRUMENT environment variable (1/timing, profile or memory) or the instrument() context manager
+# When disabled the original methods are left in place, so there is no per-call cost
+# Timings are inclusive, eg. loadDict called within __post_init__ is counted in both
+import os
+import sys
+import time
+import atexit
+import threading
+from functools import wraps
+from contextlib import contextmanager
+
+modes = ['timing','profile','memory']
+
+class instrumentState:
+    enabled = False
+    mode = 'timing'
+    lock = threading.Lock()
+    # (section, class, field) -> [count, total seconds, max seconds]
+    timings = {}
+    profiler = None
+    memory = None
+
+def ownerName(obj):
+    if obj is None:
+        return('-')
+    if isinstance(obj,type):
+        return(obj.__name__)
+    return(type(obj).__name__)
+
+# Method decorator, the section is the function's qualified name
+# fieldArg: index of the positional argument (after self) holding the field name, for per-field timings
+# Methods are registered on their class unchanged, the timing wrappers are only swapped in while instrumentation is enabled
+class timed:
+    registry = []
+
+    def __init__(self,func=None,fieldArg=None):
+        self.func = func
+        self.fieldArg = fieldArg
+
+    def __call__(self,func):
+        self.func = func
+        return(self)
+
+    def __set_name__(self,owner,name):
+        timed.registry.append((owner,name,self.func,self.fieldArg))
+        setattr(owner,name,timingWrapper(self.func,self.fieldArg) if instrumentState.enabled else self.func)
+
+def timingWrapper(func,fieldArg):
+    section = func.__qualname__
+    @wraps(func)
+    def wrapper(*args,**kwargs):
+        start = time.perf_counter()
+        try:
+            return(func(*args,**kwargs))
+        finally:
+            elapsed = time.perf_counter()-start
+            if fieldArg is not None and len(args) > fieldArg+1:
+                name = args[fieldArg+1]
+            else:
+                name = None
+            record(section,ownerName(args[0] if args else None),name,elapsed)
+    return(wrapper)
+
+def installWrappers(enabled):
+    for owner,name,func,fieldArg in timed.registry:
+        setattr(owner,name,timingWrapper(func,fieldArg) if enabled else func)
+
+def record(section,className,name,elapsed):
+    key = (section,className,name)
+    with instrumentState.lock:
+        entry = instrumentState.timings.get(key)
+        if entry is None:
+            instrumentState.timings[key] = [1,elapsed,elapsed]
+        else:
+            entry[0] += 1
+            entry[1] += elapsed
+            if elapsed > entry[2]:
+                entry[2] = elapsed
+
+def resetInstrumentation():
+    with instrumentState.lock:
+        instrumentState.timings = {}
+    instrumentState.profiler = None
+    instrumentState.memory = None
+
+def startInstrumentation(mode='timing'):
+    if mode not in modes:
+        sys.exit(f'Invalid instrumentation mode: {mode}, must be one of {modes}')
+    instrumentState.mode = mode
+    instrumentState.enabled = True
+    installWrappers(True)
+    if mode == 'profile':
+        import cProfile
+        instrumentState.profiler = cProfile.Profile()
+        instrumentState.profiler.enable()
+    elif mode == 'memory':
+        import tracemalloc
+        tracemalloc.start()
+
+def stopInstrumentation():
+    if not instrumentState.enabled:
+        return
+    instrumentState.enabled = False
+    installWrappers(False)
+    if instrumentState.mode == 'profile' and instrumentState.profiler is not None:
+        instrumentState.profiler.disable()
+    elif instrumentState.mode == 'memory':
+        import tracemalloc
+        if tracemalloc.is_tracing():
+            instrumentState.memory = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+
+# with instrument(): ... then report()
+@contextmanager
+def instrument(mode='timing',reset=True):
+    if reset:
+        resetInstrumentation()
+    startInstrumentation(mode)
+    try:
+        yield instrumentState
+    finally:
+        stopInstrumentation()
+
+# Aggregate timings by section and class (byField=False) or section, class and field
+# Returns a list of dicts sorted by total time, and prints a table (plus profile/memory top entries) if printOut
+def report(byField=True,top=None,printOut=True,stream=None):
+    with instrumentState.lock:
+        timings = dict(instrumentState.timings)
+    rows = {}
+    for (section,className,name),(count,total,longest) in timings.items():
+        key = (section,className,name if byField else None)
+        if key not in rows:
+            rows[key] = {'section':section,'class':className,'field':key[2],'count':0,'total':0.0,'max':0.0}
+        row = rows[key]
+        row['count'] += count
+        row['total'] += total
+        row['max'] = max(row['max'],longest)
+    rows = sorted(rows.values(),key=lambda r: r['total'],reverse=True)
+    for row in rows:
+        row['mean'] = row['total']/row['count']
+    if top is not None:
+        rows = rows[:top]
+    if printOut:
+        stream = stream or sys.stdout
+        print(f'{"section":<40} {"class":<24} {"field":<20} {"count":>8} {"total ms":>10} {"mean us":>10} {"max us":>10}',file=stream)
+        for row in rows:
+            print(f'{row["section"]:<40} {row["class"]:<24} {str(row["field"] or ""):<20} {row["count"]:>8} {row["total"]*1e3:>10.2f} {row["mean"]*1e6:>10.1f} {row["max"]*1e6:>10.1f}',file=stream)
+        if instrumentState.profiler is not None:
+            import pstats
+            print('',file=stream)
+            pstats.Stats(instrumentState.profiler,stream=stream).sort_stats('cumulative').print_stats(top or 25)
+        if instrumentState.memory is not None:
+            print('',file=stream)
+            for stat in instrumentState.memory.statistics('lineno')[:top or 25]:
+                print(stat,file=stream)
+    return(rows)
+
+# HELPERFUNCTIONS_INSTRUMENT=1|timing|profile|memory enables collection at import and prints a report on exit
+envMode = os.environ.get('HELPERFUNCTIONS_INSTRUMENT','').strip().lower()
+if envMode not in ['','0','false']:
+    startInstrumentation('timing' if envMode in ['1','true'] else envMode)
+    def exitReport():
+        stopInstrumentation()
+        report()
+    atexit.register(exitReport)
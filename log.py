@@ -1,17 +1,114 @@
 # output statements to console + more for debugging and logging outputs
 # Need to add option for capturing console outputs?
+# Backends (see configureLogging):
+# * print - synchronous print, the default
+# * queue - logging with a QueueHandler/QueueListener, records are formatted and written on a background thread
+# Messages below the configured level (or with verbose=False) are formatted and returned but not emitted
 from inspect import currentframe
 import sys
-def log(msg='',traceback=True,verbose=True,kill=False,cf=None):
+import atexit
+
+# Same numbers as the logging module, which is only imported by configureLogging
+levels = {'DEBUG':10,'INFO':20,'WARNING':30,'ERROR':40,'CRITICAL':50}
+
+class logConfig:
+    backend = 'print'
+    level = levels['DEBUG']
+    logger = None
+    listener = None
+    structured = False
+
+def levelNumber(level):
+    if isinstance(level,int):
+        return(level)
+    return(levels[level.upper()])
+
+def isEnabledFor(level='INFO'):
+    return(levelNumber(level) >= logConfig.level)
+
+def queueClasses():
+    import json
+    import logging
+    import logging.handlers
+
+    # Records are passed to the listener as is, so formatting happens on the background thread
+    class deferredQueueHandler(logging.handlers.QueueHandler):
+        def prepare(self,record):
+            return(record)
+
+    # One json object per line with time, level, message and (if traceback) file and line
+    class jsonFormatter(logging.Formatter):
+        def format(self,record):
+            out = {'time':self.formatTime(record),'level':record.levelname,'message':record.getMessage()}
+            if getattr(record,'location',None) is not None:
+                out['file'],out['line'] = record.location
+            return(json.dumps(out))
+
+    return(deferredQueueHandler,jsonFormatter)
+
+# backend: 'print' or 'queue'
+# level: minimum level emitted by log(), name or number
+# structured: json lines instead of plain text (queue backend only)
+# handlers: logging handlers for the listener, defaults to a StreamHandler on stdout
+def configureLogging(backend='print',level='DEBUG',structured=False,handlers=None):
+    stopLogging()
+    logConfig.backend = backend
+    logConfig.level = levelNumber(level)
+    if backend == 'print':
+        return
+    elif backend != 'queue':
+        sys.exit(f'Invalid logging backend: {backend}, must be print or queue')
+    import logging
+    import logging.handlers
+    import queue
+    deferredQueueHandler,jsonFormatter = queueClasses()
+    if handlers is None:
+        handlers = [logging.StreamHandler(sys.stdout)]
+    for handler in handlers:
+        handler.setFormatter(jsonFormatter() if structured else logging.Formatter('%(message)s'))
+    records = queue.SimpleQueue()
+    logConfig.logger = logging.getLogger('helperFunctions')
+    logConfig.logger.handlers = [deferredQueueHandler(records)]
+    logConfig.logger.setLevel(logConfig.level)
+    logConfig.logger.propagate = False
+    logConfig.structured = structured
+    logConfig.listener = logging.handlers.QueueListener(records,*handlers,respect_handler_level=True)
+    logConfig.listener.start()
+
+# Flush and stop the background listener
+def stopLogging():
+    if logConfig.listener is not None:
+        logConfig.listener.stop()
+        logConfig.listener = None
+
+atexit.register(stopLogging)
+
+# Write out queued records and flush the handlers, the listener keeps running (callers may catch the SystemExit from kill=True)
+def flushLogging():
+    if logConfig.listener is not None:
+        logConfig.listener.stop()
+        for handler in logConfig.listener.handlers:
+            handler.flush()
+        logConfig.listener.start()
+
+def log(msg='',traceback=True,verbose=True,kill=False,cf=None,level='INFO'):
+    emit = kill or (verbose and levelNumber(level) >= logConfig.level)
     if type(msg) == list or type(msg) == tuple:
         msg = ' '.join([str(m) for m in msg])
+    location = None
     if traceback:
         if cf is None:
             cf = currentframe()
-        if traceback:
-            msg = f'{msg}\n"{cf.f_back.f_code.co_filename}", line {cf.f_back.f_lineno}\n'
+        location = (cf.f_back.f_code.co_filename,cf.f_back.f_lineno)
+        if not (emit and logConfig.backend == 'queue' and logConfig.structured and not kill):
+            msg = f'{msg}\n"{location[0]}", line {location[1]}\n'
     if kill:
+        flushLogging()
         sys.exit(msg+'\nExiting Program')
-    if verbose:
+    if not emit:
+        return(msg)
+    if logConfig.backend == 'queue':
+        logConfig.logger.log(levelNumber(level),msg,extra={'location':location})
+    else:
         print(msg)
     return(msg)
@@ -6,9 +6,84 @@
 
 import re
 from dataclasses import dataclass,field
+from functools import lru_cache, cached_property
+import numpy as np
+import pandas as pd
 import geopandas as gpd
-from pyproj import CRS
+from pyproj import CRS, Transformer
 import utm
+from .instrument import timed
+
+# Grammar for degree strings in DD, DDM or DMS format with optional sign or hemisphere prefix/suffix
+# e.g. -123.1, 49 15.5N, N49°15.5', 123°06'30"W
+degreeGrammar = re.compile(r"""
+    ^\s*(?P<prefix>[NSEW+-])?\s*
+    (?P<deg>\d+(?:\.\d*)?)
+    (?:[^\d.NSEW+-]+(?P<min>\d+(?:\.\d*)?))?
+    (?:[^\d.NSEW+-]+(?P<sec>\d+(?:\.\d*)?))?
+    [^\d.NSEW+-]*(?P<suffix>[NSEW])?\s*$
+    """,re.VERBOSE)
+
+# Parsed degree value, DDM and DMS strings are only formatted on first access
+@dataclass(frozen=True)
+class degreeValue:
+    DD: float
+    hemisphere: str
+    degreeString: str = field(default='°',repr=False)
+    DDM_sig: float = field(default=5,repr=False)
+    DMS_sig: float = field(default=1,repr=False)
+
+    @cached_property
+    def DDM(self):
+        return(self.hemisphere+str(int(abs(self.DD)))+self.degreeString+' '+str(round((self.DD%1)*60,self.DDM_sig))+"`")
+
+    @cached_property
+    def DMS(self):
+        return(self.hemisphere+str(int(abs(self.DD)))+self.degreeString+' '+str(int((self.DD%1)*60))+"' "+str(round((self.DD%1*60)%1*60,self.DMS_sig))+'"')
+
+# Legacy parser, used as a fallback for strings which don't match the degreeGrammar
+def splitDegrees(value):
+    value = re.sub(r'\b(\d+)S\b|\bS\b|\bS(\d+)\b', r'-\1\2', value)
+    value = re.sub(r'\b(\d+)W\b|\bW\b|\bW(\d+)\b', r'-\1\2', value)
+    value = re.sub(r'[^0-9,.-]+',',',value)
+    value = value.replace(',,',',')
+    sign = -1 if '-' in value else 1
+    value = value.replace('-','')
+    return(sign,[float(v) for v in value.split(',') if len(v)>0])
+
+def parseDegrees(value,hemisphere='NS',DD_sig=7,DDM_sig=5,DMS_sig=1,degreeString='°'):
+    match = degreeGrammar.match(value)
+    if match:
+        sign = -1 if match['prefix'] in ('-','S','W') or match['suffix'] in ('S','W') else 1
+        parts = [float(match[k]) for k in ('deg','min','sec') if match[k] is not None]
+    else:
+        sign,parts = splitDegrees(value)
+    DD = round(sum([sign*l*m for l,m in zip(parts,[1,1/60,1/3600])]),DD_sig)
+    return(degreeValue(DD,hemisphere[1] if sign < 0 else hemisphere[0],degreeString,DDM_sig,DMS_sig))
+
+# Memoized parser, inputs often repeat the same station coordinates
+cachedParseDegrees = lru_cache(maxsize=4096)(parseDegrees)
+
+
+# Descriptor for the DDM/DMS fields, formats from the parsed degreeValue on first access when lazy=True
+class lazyDegreeString:
+    def __init__(self,coordinate,fmt):
+        self.coordinate = coordinate
+        self.fmt = fmt
+
+    def __set_name__(self,owner,name):
+        self.name = name
+
+    def __get__(self,obj,objtype=None):
+        if obj is None:
+            return(None)
+        if obj.__dict__.get(self.name) is None and self.coordinate in obj.__dict__.get('degrees',{}):
+            obj.__dict__[self.name] = getattr(obj.degrees[self.coordinate],self.fmt)
+        return(obj.__dict__.get(self.name))
+
+    def __set__(self,obj,value):
+        obj.__dict__[self.name] = value
+
 
 @dataclass
 class geographicCoordinates:
@@ -17,37 +92,95 @@ class geographicCoordinates:
     DDM_sig: float = field(default=5,repr=False)
     DMS_sig: float = field(default=1,repr=False)
     latitude: float = None
-    latitudeDDM: str = None
-    latitudeDMS: str = None
+    latitudeDDM: str = lazyDegreeString('latitude','DDM')
+    latitudeDMS: str = lazyDegreeString('latitude','DMS')
     longitude: float = None
-    longitudeDDM: str = None
-    longitudeDMS: str = None
+    longitudeDDM: str = lazyDegreeString('longitude','DDM')
+    longitudeDMS: str = lazyDegreeString('longitude','DMS')
     datum: str = 'WGS84'
     EPSG: str = None
+    # Last so positional calls keep the original field order
+    cache: bool = field(default=True,repr=False) # Memoize parsing of repeated input strings
+    lazy: bool = field(default=False,repr=False) # Only format DDM/DMS strings when first accessed
 
     def __post_init__(self):
         codes = {'WGS84':'4326','NAD83':'4269'}
         self.EPSG = codes[self.datum]
-        self.latitude,self.latitudeDDM,self.latitudeDMS = self.getDD(str(self.latitude),'NS')
-        self.longitude,self.longitudeDDM,self.longitudeDMS = self.getDD(str(self.longitude),'EW')
+        self.degrees = {}
+        if self.lazy:
+            self.degrees['latitude'] = self.parse(str(self.latitude),'NS')
+            self.degrees['longitude'] = self.parse(str(self.longitude),'EW')
+            self.latitude = self.degrees['latitude'].DD
+            self.longitude = self.degrees['longitude'].DD
+        else:
+            self.latitude,self.latitudeDDM,self.latitudeDMS = self.getDD(str(self.latitude),'NS')
+            self.longitude,self.longitudeDDM,self.longitudeDMS = self.getDD(str(self.longitude),'EW')
+
+    def parse(self,value,hemisphere):
+        if self.cache:
+            parsed = cachedParseDegrees(value,hemisphere,self.DD_sig,self.DDM_sig,self.DMS_sig,self.degreeString)
+        else:
+            parsed = parseDegrees(value,hemisphere,self.DD_sig,self.DDM_sig,self.DMS_sig,self.degreeString)
+        self.sign = -1 if parsed.hemisphere == hemisphere[1] else 1
+        return(parsed)
 
     def getDD(self,value,hemisphere):
-        value = re.sub(r'\b(\d+)S\b|\bS\b|\bS(\d+)\b', r'-\1\2', value)
-        value = re.sub(r'\b(\d+)W\b|\bW\b|\bW(\d+)\b', r'-\1\2', value)
-        value = re.sub(r'[^0-9,.-]+',',',value)
-        value = value.replace(',,',',')
-        if '-' in value: 
-            self.sign = -1
-            hemisphere = hemisphere[1]
-        else: 
-            self.sign = 1
-            hemisphere = hemisphere[0]
-        value = value.replace('-','')
-        value = [self.sign*float(v) for v in value.split(',') if len(v)>0]
-        DD = round(sum([l*m for l,m in zip(value,[1,1/60,1/3600])]),self.DD_sig)
-        DDM = hemisphere+str(int(abs(DD)))+self.degreeString+' '+str(round((DD%1)*60,self.DDM_sig))+"`"
-        DMS = hemisphere+str(int(abs(DD)))+self.degreeString+' '+str(int((DD%1)*60))+"' "+str(round((DD%1*60)%1*60,self.DMS_sig))+'"'
-        return(DD,DDM,DMS)
+        parsed = self.parse(value,hemisphere)
+        return(parsed.DD,parsed.DDM,parsed.DMS)
+
+
+# Process-wide cache of UTM zone lookups: (zone, south, datum) -> utmZone(EPSG, name, transformer)
+# CRS.to_epsg() is an expensive database search, so each zone is only resolved once
+@dataclass(frozen=True)
+class utmZone:
+    EPSG: int
+    name: str
+    transformer: Transformer = field(repr=False)
+
+class utmCRSCache:
+    zones = {}
+    hits = 0
+    misses = 0
+    geographicCodes = {'WGS84':'4326','NAD83':'4269'}
+
+    @classmethod
+    def get(cls,zone,south,datum='WGS84'):
+        key = (int(zone),bool(south),datum)
+        if key in cls.zones:
+            cls.hits += 1
+            return(cls.zones[key])
+        cls.misses += 1
+        return(cls.resolve(key))
+
+    @classmethod
+    def resolve(cls,key):
+        zone,south,datum = key
+        crs = CRS.from_dict({'proj': 'utm', 'zone': zone, 'south': south, 'datum': datum})
+        cls.zones[key] = utmZone(
+            EPSG=crs.to_epsg(),
+            name=crs.coordinate_operation.name,
+            transformer=Transformer.from_crs(f'EPSG:{cls.geographicCodes[datum]}',crs,always_xy=True))
+        return(cls.zones[key])
+
+    # Resolve zones ahead of time, defaults to all 60 zones in both hemispheres
+    @classmethod
+    def warm(cls,zones=range(1,61),hemispheres=(False,True),datums=('WGS84',)):
+        for datum in datums:
+            for zone in zones:
+                for south in hemispheres:
+                    key = (int(zone),bool(south),datum)
+                    if key not in cls.zones:
+                        cls.resolve(key)
+
+    @classmethod
+    def stats(cls):
+        return({'size':len(cls.zones),'hits':cls.hits,'misses':cls.misses})
+
+    @classmethod
+    def clear(cls):
+        cls.zones.clear()
+        cls.hits = 0
+        cls.misses = 0
 
 
 @dataclass
@@ -63,12 +196,17 @@ class utmCoordinates:
 
     def __post_init__(self):
         if self.latitude and self.longitude:
-            UTM_coords = utm.from_latlon(self.latitude,self.longitude)
-            crs = CRS.from_dict({'proj': 'utm', 'zone': UTM_coords[2], 'south': UTM_coords[3]<'N', 'datum': self.datum})
-            self.EPSG=crs.to_epsg()
-            self.name = crs.coordinate_operation.name
-            self.x = round(UTM_coords[0],self.UTM_sig)
-            self.y = round(UTM_coords[1],self.UTM_sig)
+            # Same range checks as utm.from_latlon
+            if not -80 <= self.latitude <= 84:
+                raise utm.OutOfRangeError('latitude out of range (must be between 80 deg S and 84 deg N)')
+            if not -180 <= self.longitude <= 180:
+                raise utm.OutOfRangeError('longitude out of range (must be between 180 deg W and 180 deg E)')
+            zone = utmCRSCache.get(utm.latlon_to_zone_number(self.latitude,self.longitude),self.latitude<0,self.datum)
+            self.EPSG = zone.EPSG
+            self.name = zone.name
+            x,y = zone.transformer.transform(self.longitude,self.latitude)
+            self.x = round(x,self.UTM_sig)
+            self.y = round(y,self.UTM_sig)
 
 
 @dataclass(kw_only=True)
@@ -81,6 +219,7 @@ class parseCoordinates:
     geojson: dict = field(default_factory=lambda:{},repr=False)
     geodataframe: gpd.GeoDataFrame = field(default_factory=lambda:gpd.GeoDataFrame(),repr=False)
     
+    @timed
     def __post_init__(self):
         if not self.latitude or not self.longitude:
             return
@@ -100,3 +239,122 @@ class parseCoordinates:
                 },
                 ]}
 
+    @classmethod
+    def from_arrays(cls,UID,latitude,longitude,attributes=None,datum='WGS84'):
+        return(parseCoordinatesBatch(UID=UID,latitude=latitude,longitude=longitude,attributes=attributes,datum=datum))
+
+
+# Vectorized version of utm.latlon_to_zone_number, including the Norway/Svalbard exceptions
+def utmZoneNumbers(latitude,longitude):
+    latitude = np.asarray(latitude,dtype=float)
+    longitude = (np.asarray(longitude,dtype=float) % 360 + 540) % 360 - 180
+    zone = ((longitude + 180) / 6).astype(int) + 1
+    zone = np.where((latitude >= 56) & (latitude < 64) & (longitude >= 3) & (longitude < 12),32,zone)
+    svalbard = (latitude >= 72) & (latitude <= 84) & (longitude >= 0)
+    for lower,upper,z in [(0,9,31),(9,21,33),(21,33,35),(33,42,37)]:
+        zone = np.where(svalbard & (longitude >= lower) & (longitude < upper),z,zone)
+    return(zone)
+
+
+# Batch version of parseCoordinates for many points at once
+# * Numeric inputs are converted in one pass, strings (DDM/DMS) are parsed once per unique value
+# * Points are grouped by UTM zone and each zone is projected with one pyproj call
+# * Outputs one GeoDataFrame (geographic crs, with UTM columns) and one GeoJSON FeatureCollection
+#   projectedCoordinates holds one GeoDataFrame per UTM zone, keyed by EPSG code
+# * Rows which are missing, can't be parsed or are outside the UTM range (80 deg S to 84 deg N) are invalid:
+#   null geometry, nan x/y and EPSG None (valid holds the mask)
+@dataclass(kw_only=True)
+class parseCoordinatesBatch:
+    UID: list = None
+    latitude: list = None
+    longitude: list = None
+    attributes: dict = field(default=None,repr=False)
+    datum: str = field(default='WGS84',repr=False)
+    UTM_sig: int = field(default=3,repr=False)
+    geojson: dict = field(default_factory=lambda:{},repr=False)
+    geodataframe: gpd.GeoDataFrame = field(default_factory=lambda:gpd.GeoDataFrame(),repr=False)
+    projectedCoordinates: dict = field(default_factory=lambda:{},repr=False)
+
+    @timed
+    def __post_init__(self):
+        if self.latitude is None or self.longitude is None:
+            return
+        codes = {'WGS84':'4326','NAD83':'4269'}
+        self.EPSG = codes[self.datum]
+        # Without UID the index of a pandas Series input is kept
+        index = next((v.index for v in [self.latitude,self.longitude] if isinstance(v,pd.Series)),None)
+        self.latitude = self.parseDD(self.latitude,'NS')
+        self.longitude = self.parseDD(self.longitude,'EW')
+        if len(self.latitude) != len(self.longitude):
+            raise ValueError(f'latitude ({len(self.latitude)}) and longitude ({len(self.longitude)}) must be the same length')
+        if self.UID is None:
+            self.UID = list(index) if index is not None else list(range(len(self.latitude)))
+        self.UID = list(self.UID)
+        if isinstance(self.attributes,pd.DataFrame):
+            attributes = self.attributes.reset_index(drop=True)
+        elif self.attributes is None:
+            attributes = pd.DataFrame(index=range(len(self.latitude)))
+        else:
+            attributes = pd.DataFrame(self.attributes)
+        self.projectUTM()
+        df = attributes.copy()
+        df['latitude'] = self.latitude
+        df['longitude'] = self.longitude
+        df['x'] = self.x
+        df['y'] = self.y
+        df['EPSG'] = self.UTM_EPSG
+        df['name'] = self.UTM_name
+        points = gpd.points_from_xy(self.longitude,self.latitude)
+        points[~self.valid] = None
+        self.geodataframe = gpd.GeoDataFrame(
+            data=df.set_index(pd.Index(self.UID)),
+            geometry=points,
+            crs=self.EPSG)
+        for epsg,index in self.zones.items():
+            self.projectedCoordinates[epsg] = gpd.GeoDataFrame(
+                data=attributes.iloc[index].reset_index(drop=True).set_index(pd.Index([self.UID[i] for i in index])),
+                geometry=gpd.points_from_xy(self.x[index],self.y[index]),
+                crs=epsg)
+        # to_dict gives no records for a frame without columns
+        properties = attributes.to_dict(orient='records') if len(attributes.columns) else [{} for i in range(len(attributes))]
+        self.geojson = {
+            "type": "FeatureCollection",
+            "features": [{
+                "type": "Feature",
+                "properties": {"UID": uid}|props,
+                "geometry": {"type": "Point","coordinates": [lon, lat]} if valid else None
+                } for uid,props,lat,lon,valid in zip(self.UID,properties,self.latitude.tolist(),self.longitude.tolist(),self.valid.tolist())
+                ]}
+
+    def parseDD(self,values,hemisphere):
+        values = pd.Series(list(values) if not isinstance(values,pd.Series) else values.values,dtype=object)
+        numeric = pd.to_numeric(values,errors='coerce')
+        out = numeric.to_numpy(dtype=float,copy=True)
+        unparsed = numeric.isna() & values.notna()
+        if unparsed.any():
+            lookup = {v:cachedParseDegrees(str(v),hemisphere).DD for v in values[unparsed].unique()}
+            out[unparsed.to_numpy()] = values[unparsed].map(lookup).to_numpy(dtype=float)
+        return(np.round(out,geographicCoordinates.DD_sig))
+
+    def projectUTM(self):
+        n = len(self.latitude)
+        self.x = np.full(n,np.nan)
+        self.y = np.full(n,np.nan)
+        self.UTM_EPSG = np.full(n,None,dtype=object)
+        self.UTM_name = np.full(n,None,dtype=object)
+        self.zones = {}
+        with np.errstate(invalid='ignore'):
+            valid = (self.latitude >= -80) & (self.latitude <= 84) & (self.longitude >= -180) & (self.longitude <= 180)
+        self.valid = valid
+        zone = utmZoneNumbers(np.where(valid,self.latitude,0),np.where(valid,self.longitude,0))
+        south = self.latitude < 0
+        for (z,s) in set(zip(zone[valid].tolist(),south[valid].tolist())):
+            index = np.flatnonzero(valid & (zone == z) & (south == s))
+            utmZone = utmCRSCache.get(z,s,self.datum)
+            x,y = utmZone.transformer.transform(self.longitude[index],self.latitude[index])
+            self.x[index] = np.round(x,self.UTM_sig)
+            self.y[index] = np.round(y,self.UTM_sig)
+            self.UTM_EPSG[index] = utmZone.EPSG
+            self.UTM_name[index] = utmZone.name
+            self.zones[utmZone.EPSG] = index
+
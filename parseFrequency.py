@@ -1,17 +1,78 @@
 import re
+from functools import lru_cache
+from .log import log
 #Parse a measurement frequency from assorted string input formats to a standard format compatible with pandas datetime
 
+# Substitutions are applied in order (as case-insensitive regexes), patterns are compiled once
+freqDict = {'MSEC':'ms','Usec':'us','Sec':'s','HR':'h','MIN':'min','T':'min'}
+freqPatterns = [(re.compile(key.lower(),flags=re.IGNORECASE),value) for key,value in freqDict.items()]
+firstDigit = re.compile(r"\d")
+unsafe = re.compile(r'[^a-zA-Z0-9.]')
+hertz = re.compile(r'^([0-9.]*)hz$',flags=re.IGNORECASE)
+
 def parseFrequency(text,debug=False):
-    def split_digit(s):
-        match = re.search(r"\d", s)
-        if match:
-            s = s[match.start():]
-        return s 
     if debug:
         breakpoint()
-    freqDict = {'MSEC':'ms','Usec':'us','Sec':'s','HR':'h','MIN':'min','T':'min'}
-    freq = split_digit(text)
-    for key,value in freqDict.items():
-        freq = re.sub(key.lower(), value, freq, flags=re.IGNORECASE)
-    freq = re.sub(r'[^a-zA-Z0-9.]','',freq)
-    return(freq)
\ No newline at end of file
+    return(cachedParseFrequency(text))
+
+# Memoized, column headers repeat across files
+@lru_cache(maxsize=4096)
+def cachedParseFrequency(text):
+    match = firstDigit.search(text)
+    freq = text[match.start():] if match else text
+    for pattern,value in freqPatterns:
+        freq = pattern.sub(value,freq)
+    freq = unsafe.sub('',freq)
+    return(freq)
+
+# Parsed frequency as a pandas Timedelta (NaT if it can't be interpreted), Hz are converted to periods
+@lru_cache(maxsize=4096)
+def frequencyTimedelta(freq):
+    import pandas as pd
+    match = hertz.match(freq)
+    try:
+        if match:
+            return(pd.Timedelta(seconds=1/float(match.group(1) or 1)))
+        return(pd.Timedelta(pd.tseries.frequencies.to_offset(freq)))
+    except (ValueError,TypeError,ZeroDivisionError):
+        return(pd.NaT)
+
+# Parsed frequency as a pandas offset (None if it can't be interpreted), Hz are converted to a fixed nanosecond offset
+@lru_cache(maxsize=4096)
+def frequencyOffset(freq):
+    import pandas as pd
+    if hertz.match(freq):
+        td = frequencyTimedelta(freq)
+        return(None if td is pd.NaT else pd.tseries.frequencies.to_offset(td))
+    try:
+        return(pd.tseries.frequencies.to_offset(freq))
+    except (ValueError,TypeError):
+        return(None)
+
+# Batch version for a list/array/Series of frequency strings, each unique value is parsed once
+# output:
+# * string - normalized strings (as parseFrequency)
+# * timedelta - pandas Timedelta objects (NaT where invalid)
+# * offset - pandas offsets for resampling (None where invalid)
+# * nanoseconds - int64 numpy array of periods in ns (NaT's value, the minimum int64, where invalid)
+# A Series input returns a Series with the same index (except for nanoseconds)
+def parseFrequencies(values,output='string'):
+    outputs = {'string':lambda f: f,'timedelta':frequencyTimedelta,'offset':frequencyOffset,'nanoseconds':lambda f: frequencyTimedelta(f).value}
+    if output not in outputs:
+        log(f'Invalid output: {output}, must be one of {list(outputs)}',kill=True)
+    # Only pandas objects keep their index
+    index = values.index if hasattr(values,'iloc') else None
+    convert = outputs[output]
+    parsed = {}
+    out = []
+    for value in values:
+        if value not in parsed:
+            parsed[value] = convert(cachedParseFrequency(value))
+        out.append(parsed[value])
+    if output == 'nanoseconds':
+        import numpy as np
+        return(np.array(out,dtype=np.int64))
+    if index is not None:
+        import pandas as pd
+        return(pd.Series(out,index=index,dtype=object))
+    return(out)
@@ -1,8 +1,73 @@
 import string
 import random
+import secrets
+from .log import log
+
+characterSets = {True:string.ascii_letters + string.digits,False:string.digits}
+
 def randomID(length=6,alphanumeric=True):
-    if alphanumeric:
-        characters = string.ascii_letters + string.digits
+    return(''.join(random.choices(characterSets[bool(alphanumeric)],k=length)))
+
+# bytes.translate table mapping random bytes to characters, bytes past the last multiple of len(characters) are deleted (no modulo bias)
+def byteTable(characters):
+    limit = 256 - 256 % len(characters)
+    table = bytes(ord(characters[b % len(characters)]) if b < limit else 0 for b in range(256))
+    return(table,bytes(range(limit,256)))
+
+byteTables = {alphanumeric:byteTable(characters) for alphanumeric,characters in characterSets.items()}
+
+# Batch of n IDs from random byte buffers
+# unique: no duplicates within the batch (or with exclude), by rejecting repeats or, when the batch is a large share of all possible IDs, sampling without replacement
+# secure: bytes from the secrets module (os.urandom)
+# seed: reproducible output (random.Random(seed)), ignored if secure
+def randomIDs(n,length=6,alphanumeric=True,unique=False,secure=False,seed=None,exclude=None):
+    characters = characterSets[bool(alphanumeric)]
+    # As randomID, a length of 0 or less gives empty IDs
+    length = max(length,0)
+    capacity = len(characters)**length
+    exclude = set(exclude) if exclude is not None else set()
+    if secure:
+        rng = secrets.SystemRandom()
+        randbytes = secrets.token_bytes
     else:
-        characters = string.digits
-    return(''.join(random.choices(characters,k=length)))
\ No newline at end of file
+        rng = random.Random(seed) if seed is not None else random
+        randbytes = rng.randbytes
+    if unique and n + len(exclude) > capacity:
+        log(f'Cannot generate {n} unique IDs of length {length}, only {capacity} exist',kill=True)
+    if length == 0:
+        return(['']*n)
+    if unique and (n + len(exclude)) * 4 > capacity:
+        return(sampledIDs(n,length,characters,rng,exclude))
+    table,delete = byteTables[bool(alphanumeric)]
+    out = []
+    seen = exclude
+    while len(out) < n:
+        needed = (n - len(out)) * length
+        # Expected share of accepted bytes, plus a margin
+        buffer = randbytes(int(needed * 256 / (256 - len(delete)) * 1.02) + 64)
+        text = buffer.translate(table,delete).decode('ascii')
+        ids = [text[i:i+length] for i in range(0,min(len(text)//length,n-len(out))*length,length)]
+        if unique:
+            for ID in ids:
+                if ID not in seen:
+                    seen.add(ID)
+                    out.append(ID)
+        else:
+            out.extend(ids)
+    return(out)
+
+# Unique IDs by sampling integers without replacement and encoding them with the character set
+def sampledIDs(n,length,characters,rng,exclude):
+    base = len(characters)
+    out = []
+    for value in rng.sample(range(base**length),n+len(exclude)):
+        digits = []
+        for i in range(length):
+            value,r = divmod(value,base)
+            digits.append(characters[r])
+        ID = ''.join(digits)
+        if ID not in exclude:
+            out.append(ID)
+            if len(out) == n:
+                break
+    return(out)
@@ -1,24 +1,107 @@
 # replace all non-alphanumeric characters with a safe value
 import re
 import string
+from functools import lru_cache
 printable = set(string.printable)
 
+# str.translate table deleting characters which aren't permitted
+# Characters are looked up (and cached) the first time they are seen, so any unicode input works
+class permitTable(dict):
+    def __init__(self,permitted,replace={}):
+        super().__init__({ord(k):v for k,v in replace.items()})
+        self.permitted = permitted
+
+    def __missing__(self,code):
+        self[code] = code if chr(code) in self.permitted else None
+        return(self[code])
+
+# Translators keyed on the permit and replace configuration (callers' sets aren't modified)
+# Single character replacements are merged into the table when applying them all at once gives the same result as in sequence
+@lru_cache(maxsize=256)
+def cleanTranslator(permit=frozenset(),replace=()):
+    permitted = frozenset(printable) | permit
+    merge = all(len(k) == 1 for k,v in replace) and not any(k in v for k,_ in replace for _,v in replace)
+    if merge:
+        table = permitTable(permitted,{k:''.join(c for c in v if c in permitted) for k,v in replace})
+        return(table,())
+    return(permitTable(permitted),replace)
+
+def translatorKey(replace,permit):
+    if isinstance(permit,(str,list,tuple)):
+        permit = set(permit)
+    return(frozenset(permit),tuple(replace.items()))
+
+defaultTable = cleanTranslator()[0]
+
 # Formats string to be printable
 def cleanString(stringIn,replace={},permit=set()):
-    if isinstance(permit,str):
-        permit=set(permit)
-    elif isinstance(permit,list):
-        permit=set(permit)
-    permit.update(printable)
-    for k,v in replace.items():
+    if not replace and not permit:
+        return(stringIn.translate(defaultTable))
+    table,sequential = cleanTranslator(*translatorKey(replace,permit))
+    for k,v in sequential:
         stringIn = stringIn.replace(k,v)
-    stringOut = ''.join(filter(lambda x: x in permit, stringIn))
-    return(stringOut)
+    return(stringIn.translate(table))
 
+# Compiled safeFormat patterns
+safePatterns = {}
 
 # Formats string to be safe for a filename (replaces all non alphanumeric characters with underscores by default)
 def safeFormat(stringIn,safeCharacters='[^0-9a-zA-Z-]+',safeFill='_'):
-    stringOut = re.sub(safeCharacters,safeFill, str(stringIn)).rstrip(safeFill).lstrip(safeFill)
+    pattern = safePatterns.get(safeCharacters)
+    if pattern is None:
+        pattern = safePatterns[safeCharacters] = re.compile(safeCharacters)
+    stringOut = pattern.sub(safeFill, str(stringIn)).strip(safeFill)
     if stringOut == '':
         stringOut = safeFill
-    return(stringOut)
\ No newline at end of file
+    return(stringOut)
+
+# Deduplicate names in one pass, later collisions get a numbered suffix (name, name_1, name_2, ...)
+# Suffixed names also avoid names already in the list
+def uniqueNames(names,separator='_'):
+    names = list(names)
+    taken = set(names)
+    counts = {}
+    seen = set()
+    out = []
+    for name in names:
+        if name not in seen:
+            seen.add(name)
+            out.append(name)
+            continue
+        k = counts.get(name,0)
+        while True:
+            k += 1
+            candidate = f'{name}{separator}{k}'
+            if candidate not in taken and candidate not in seen:
+                break
+        counts[name] = k
+        seen.add(candidate)
+        out.append(candidate)
+    return(out)
+
+# Batch versions for lists/arrays/Series (a Series returns a Series with the same index)
+# Repeated values are only processed once, unique=True deduplicates collisions after sanitation
+def cleanStrings(values,replace={},permit=set(),unique=False):
+    table,sequential = cleanTranslator(*translatorKey(replace,permit))
+    def clean(s):
+        for k,v in sequential:
+            s = s.replace(k,v)
+        return(s.translate(table))
+    return(batch(values,clean,unique,'_'))
+
+def safeFormats(values,safeCharacters='[^0-9a-zA-Z-]+',safeFill='_',unique=False):
+    return(batch(values,lambda s: safeFormat(s,safeCharacters,safeFill),unique,safeFill))
+
+def batch(values,fn,unique,separator):
+    done = {}
+    out = []
+    for value in values:
+        if value not in done:
+            done[value] = fn(value)
+        out.append(done[value])
+    if unique:
+        out = uniqueNames(out,separator)
+    if hasattr(values,'iloc'):
+        import pandas as pd
+        return(pd.Series(out,index=values.index))
+    return(out)
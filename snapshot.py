@@ -0,0 +1,97 @@
+# Compact binary snapshots of dataclass state
+# Layout: MAGIC | header length | json header | payload length | pickle payload | out-of-band buffers
+# * The json header holds the schema (field names and types) so it can be validated before unpickling
+# * Payload uses pickle protocol 5, so datetimes and nested dataclasses round trip exactly
+# * Large buffers (e.g. numpy arrays) are stored out-of-band, aligned to 64 bytes, and loaded zero-copy
+# Only load snapshots from trusted sources, the payload is a pickle
+import json
+import mmap
+import pickle
+import struct
+
+MAGIC = b'HFSNAP1\n'
+ALIGN = 64
+# Buffers smaller than this are left in the pickle payload
+OUT_OF_BAND_MIN = 4096
+
+def typeName(dtype):
+    return(getattr(dtype,'__name__',str(dtype)))
+
+def schema(cls):
+    return({name:typeName(f.type) for name,f in cls.__dataclass_fields__.items()})
+
+def pad(n):
+    return((-n) % ALIGN)
+
+def packSnapshot(cls,state):
+    buffers = []
+    def bufferCallback(buffer):
+        if buffer.raw().nbytes < OUT_OF_BAND_MIN:
+            return(True)
+        buffers.append(buffer)
+        return(False)
+    payload = pickle.dumps(state,protocol=5,buffer_callback=bufferCallback)
+    offsets = []
+    position = 0
+    for buffer in buffers:
+        offsets.append([position,buffer.raw().nbytes])
+        position += buffer.raw().nbytes + pad(buffer.raw().nbytes)
+    header = json.dumps({
+        'class':f'{cls.__module__}.{cls.__qualname__}',
+        'fields':schema(cls),
+        'buffers':offsets,
+        }).encode()
+    chunks = [MAGIC,struct.pack('<Q',len(header)),header,struct.pack('<Q',len(payload)),payload]
+    start = sum(len(c) for c in chunks)
+    chunks.append(b'\0'*pad(start))
+    for buffer in buffers:
+        chunks.append(buffer.raw())
+        chunks.append(b'\0'*pad(buffer.raw().nbytes))
+    return(b''.join(chunks))
+
+# Length prefixed section starting at position, truncated data raises ValueError
+def section(view,position,name):
+    if position + 8 > len(view):
+        raise ValueError(f'Truncated snapshot: missing {name} length')
+    length, = struct.unpack_from('<Q',view,position)
+    position += 8
+    if position + length > len(view):
+        raise ValueError(f'Truncated snapshot: {name} needs {length} bytes, {len(view)-position} left')
+    return(view[position:position+length],position+length)
+
+# Returns (header,state), data can be bytes, bytearray, memoryview or mmap
+# Out-of-band buffers are views into data (read-only if data is)
+def unpackSnapshot(data):
+    view = memoryview(data)
+    if bytes(view[:len(MAGIC)]) != MAGIC:
+        raise ValueError('Not a snapshot: bad magic number')
+    header,position = section(view,len(MAGIC),'header')
+    header = json.loads(bytes(header))
+    payload,position = section(view,position,'payload')
+    position += pad(position)
+    try:
+        offsets = [(int(offset),int(length)) for offset,length in header['buffers']]
+    except (KeyError,TypeError,ValueError) as e:
+        raise ValueError(f'Corrupt snapshot header: {e}')
+    for offset,length in offsets:
+        if offset < 0 or length < 0 or position + offset + length > len(view):
+            raise ValueError(f'Truncated snapshot: buffer at {offset} needs {length} bytes')
+    buffers = [view[position+offset:position+offset+length] for offset,length in offsets]
+    try:
+        state = pickle.loads(payload,buffers=buffers)
+    except pickle.UnpicklingError:
+        raise
+    except Exception as e:
+        # A corrupt payload can fail in many ways (EOFError, TypeError, ...)
+        raise ValueError(f'Corrupt snapshot payload: {type(e).__name__}: {e}')
+    return(header,state)
+
+def readSnapshot(fileName,useMmap=False):
+    with open(fileName,'rb') as file:
+        if useMmap:
+            return(mmap.mmap(file.fileno(),0,access=mmap.ACCESS_READ))
+        # Read into a writable buffer so arrays loaded from it are writable
+        data = bytearray(file.seek(0,2))
+        file.seek(0)
+        file.readinto(data)
+        return(data)